@@ -1,11 +1,23 @@
 """Google API utilities for Calendar, Gmail, Drive, and Sheets.
 """
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from goog.base import Context, RateLimitError, clean_filename, configure
 from goog.base import get_settings, is_rate_limit
-from goog.calendar import Calendar
-from goog.drive import Drive
-from goog.gmail import Gmail
-from goog.sheets import Sheets
+
+if TYPE_CHECKING:
+    from goog.calendar import Calendar
+    from goog.drive import Drive
+    from goog.gmail import Gmail
+    from goog.sheets import Sheets
+
+_lazy = {
+    'Calendar': 'goog.calendar',
+    'Drive': 'goog.drive',
+    'Gmail': 'goog.gmail',
+    'Sheets': 'goog.sheets',
+    }
 
 __all__ = [
     'configure',
@@ -19,3 +31,13 @@ __all__ = [
     'Drive',
     'Sheets',
     ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import client classes on first access.
+    """
+    if name not in _lazy:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_lazy[name]), name)
+    globals()[name] = value
+    return value
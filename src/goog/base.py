@@ -1,16 +1,69 @@
 """Base authentication context for Google APIs.
 """
+import functools
+import json
 import logging
+import random
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
-from apiclient import discovery
-from google.oauth2 import service_account
-from googleapiclient.errors import HttpError
+import cachu
+from googleapiclient import discovery_cache
+from googleapiclient.errors import HttpError, UnknownApiNameOrVersion
 
 logger = logging.getLogger(__name__)
 
 _settings = {}
 
+BATCH_LIMIT = 100
+
+BATCH_RETRIES = 3
+
+_service_cache: dict[tuple, Any] = {}
+
+_discovery_docs: dict[tuple[str, str | None], dict[str, Any]] = {}
+
+_thread_local = threading.local()
+
+PREFETCH_WORKERS = 4
+
+_prefetch_executor: ThreadPoolExecutor | None = None
+
+_prefetch_lock = threading.Lock()
+
+
+def _prefetch_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool that lists next pages ahead of callers.
+
+    Its threads live for the whole process, so each keeps its pooled
+    connection across listings instead of opening a new one per listing.
+    """
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS, thread_name_prefix='goog-prefetch')
+    return _prefetch_executor
+
+
+def _pooled_http() -> Any:
+    """Return the calling thread's Http whose connections its services share.
+
+    Each service wraps it in its own AuthorizedHttp, so credentials stay
+    per service while the keep-alive connection to googleapis.com is
+    reused across Drive, Gmail and Calendar. httplib2.Http is not
+    thread-safe, so every thread gets its own pool.
+    """
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        from googleapiclient.http import build_http
+        http = _thread_local.http = build_http()
+    return http
+
 
 def configure(
     account: str | None = None,
@@ -18,11 +71,20 @@ def configure(
     rootid: dict[str, str] | None = None,
     mail_from: str | None = None,
     app_configs: dict[str, dict[str, Any]] | None = None,
+    download_chunksize: int | None = None,
+    resumable_threshold: int | None = None,
+    upload_chunksize: int | None = None,
+    cache_dir: str | None = None,
+    max_workers: int | None = None,
 ) -> None:
     """Configure module defaults.
 
     This should be called once at application startup to set default values
-    that will be used across all Google API clients.
+    that will be used across all Google API clients. Resolved Drive folder
+    and file ids are kept in sqlite files under cache_dir (~/.cache/goog by
+    default), so later processes skip the path lookups until the entries
+    expire. max_workers sets the default pool size for Drive's
+    download_many and write_many.
 
     Example:
         >>> import goog
@@ -55,6 +117,26 @@ def configure(
         _settings['mail_from'] = mail_from
     if app_configs is not None:
         _settings['app_configs'] = app_configs
+    if download_chunksize is not None:
+        _settings['download_chunksize'] = download_chunksize
+    if resumable_threshold is not None:
+        _settings['resumable_threshold'] = resumable_threshold
+    if upload_chunksize is not None:
+        _settings['upload_chunksize'] = upload_chunksize
+    if max_workers is not None:
+        _settings['max_workers'] = max_workers
+    if cache_dir is not None:
+        _settings['cache_dir'] = cache_dir
+        _use_cache_dir(cache_dir)
+
+
+def _use_cache_dir(cache_dir: str) -> None:
+    """Point goog's file-backed caches at cache_dir, reopening them if it moved.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    if cachu.get_config(package='goog').file_dir != str(cache_dir):
+        cachu.configure(file_dir=cache_dir)
+        cachu.clear_backends('goog')
 
 
 def get_settings() -> dict[str, Any]:
@@ -83,16 +165,55 @@ def is_rate_limit(exc: HttpError) -> bool:
     return False
 
 
+def _execute_with_retry(batch: Any, num_retries: int = BATCH_RETRIES) -> None:
+    """Execute a batch, retrying transient failures of the batch POST itself.
+    """
+    import httplib2
+    for attempt in range(num_retries + 1):
+        try:
+            batch.execute()
+            return
+        except HttpError as exc:
+            if attempt == num_retries or not (exc.resp.status >= 500 or is_rate_limit(exc)):
+                raise
+            logger.warning(f'Batch request failed ({exc.resp.status}), retrying')
+        except (OSError, httplib2.HttpLib2Error) as exc:
+            if attempt == num_retries:
+                raise
+            logger.warning(f'Batch request failed ({exc}), retrying')
+        time.sleep(random.random() * 2 ** attempt)
+
+
+def _discovery_document(app: str, version: str | None) -> dict[str, Any]:
+    """Load the bundled discovery document for an API, parsed once per process.
+    """
+    doc_key = (app, version)
+    if doc_key not in _discovery_docs:
+        content = discovery_cache.get_static_doc(app, version)
+        if content is None:
+            raise UnknownApiNameOrVersion(f'name: {app}  version: {version}')
+        _discovery_docs[doc_key] = json.loads(content)
+    return _discovery_docs[doc_key]
+
+
+@functools.lru_cache(maxsize=4096)
 def clean_filename(fname: str) -> str:
-    """Clean filename by escaping single quotes.
+    """Escape backslashes and single quotes for a Drive query string literal.
     """
-    return fname.replace("'", "\\'")
+    return fname.replace('\\', '\\\\').replace("'", "\\'")
 
 
 class Context:
     """Base class that provides backend authentication for Google APIs.
+
+    Built services are cached per thread and configuration, so contexts
+    created on the same thread with the same app, version, account, key
+    and scopes share one service and transport. Contexts created on
+    different threads never share a transport.
     """
 
+    _credentials: Any = None
+
     def __init__(self, app: str | None = None, account: str | None = None,
                  key: str | None = None, scopes: list[str] | None = None,
                  version: str | None = None) -> None:
@@ -107,6 +228,72 @@ class Context:
         self.app = app
         self.cx = self._build_service(key, scopes, version)
 
+    @classmethod
+    def clear_service_cache(cls) -> None:
+        """Drop all cached API services and discovery documents.
+        """
+        _service_cache.clear()
+        _discovery_docs.clear()
+
+    def _thread_http(self) -> Any:
+        """Return an authorized Http owned by the calling thread.
+
+        httplib2.Http is not thread-safe, so requests executed from worker
+        threads pass this to execute(http=...) instead of sharing self.cx's.
+        """
+        https = _thread_local.__dict__.setdefault('https', {})
+        entry = https.get(id(self._credentials))
+        if entry is None or entry[0] is not self._credentials:
+            import google_auth_httplib2
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=_pooled_http())
+            entry = https[id(self._credentials)] = (self._credentials, http)
+        return entry[1]
+
+    def _thread_session(self) -> Any:
+        """Return an AuthorizedSession owned by the calling thread.
+
+        Used for streamed media downloads, which httplib2 cannot do.
+        """
+        sessions = _thread_local.__dict__.setdefault('sessions', {})
+        entry = sessions.get(id(self._credentials))
+        if entry is None or entry[0] is not self._credentials:
+            from google.auth.transport.requests import AuthorizedSession
+            entry = sessions[id(self._credentials)] = (
+                self._credentials, AuthorizedSession(self._credentials))
+        return entry[1]
+
+    def new_batch(self, callback: Any = None) -> Any:
+        """Create a BatchHttpRequest bound to this service's batch endpoint.
+        """
+        return self.cx.new_batch_http_request(callback=callback)
+
+    def _execute_batch(self, requests: Iterable[tuple[str, Any]],
+                       limit: int = BATCH_LIMIT) -> dict[str, Any]:
+        """Execute (request_id, request) pairs in batches of up to limit.
+
+        A batch POST that fails with a 5xx, a rate limit or a connection
+        error is retried with backoff. Returns a mapping of request_id to the
+        sub-request's response, or to the HttpError raised for that
+        sub-request.
+        """
+        results: dict[str, Any] = {}
+
+        def _collect(request_id, response, exception):
+            results[request_id] = exception if exception is not None else response
+
+        batch, pending = None, 0
+        for request_id, request in requests:
+            if batch is None:
+                batch = self.new_batch(_collect)
+            batch.add(request, request_id=request_id)
+            pending += 1
+            if pending == limit:
+                _execute_with_retry(batch)
+                batch, pending = None, 0
+        if batch is not None:
+            _execute_with_retry(batch)
+        return results
+
     def _build_service(self, key: str | None, scopes: list[str] | None,
                        version: str | None) -> Any:
         """Authenticate and build Google API service.
@@ -123,9 +310,23 @@ class Context:
         elif version is None and self.app in app_configs:
             version = app_configs[self.app].get('version')
 
+        cache_key = (threading.get_ident(), self.app, version, self.account,
+                     key, tuple(scopes or ()))
+        if cache_key in _service_cache:
+            logger.debug(f'Reusing Google API service for {self.app} {version} {self.account}')
+            api, self._credentials = _service_cache[cache_key]
+            return api
+
+        import google_auth_httplib2
+        from google.oauth2 import service_account
+        from googleapiclient import discovery
         creds = service_account.Credentials.from_service_account_file(key)
         creds = creds.with_scopes(scopes)
         creds = creds.with_subject(self.account)
-        api = discovery.build(self.app, version, credentials=creds)
+        doc = _discovery_document(self.app, version)
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=_pooled_http())
+        api = discovery.build_from_document(doc, http=http)
+        _service_cache[cache_key] = (api, creds)
+        self._credentials = creds
         logger.info(f'Built Google OAuth API service for {self.app} {version} {self.account}')
         return api
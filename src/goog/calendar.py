@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from goog.base import Context
+from googleapiclient.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
@@ -43,3 +44,37 @@ class Calendar(Context):
         """
         logger.info('Creating calendar events')
         return self.cx.events().insert(**kw).execute(num_retries=3)
+
+    def delete_events_many(self, calendar_id: str, event_ids: list[str],
+                           **kw: Any) -> dict[str, Any]:
+        """Delete calendar events with batched requests (up to 100 per HTTP call).
+
+        Returns a mapping of event ID to the API response, or to the
+        HttpError raised for that event.
+        """
+        logger.info(f'Deleting {len(event_ids)} calendar events')
+        events = self.cx.events()
+        results = self._execute_batch(
+            (event_id, events.delete(calendarId=calendar_id, eventId=event_id, **kw))
+            for event_id in dict.fromkeys(event_ids))
+        for event_id, result in results.items():
+            if isinstance(result, HttpError):
+                logger.error(f'Failed to delete event {event_id}: {result}')
+        return results
+
+    def insert_events_many(self, calendar_id: str, bodies: list[dict[str, Any]],
+                           **kw: Any) -> list[Any]:
+        """Insert calendar events with batched requests (up to 100 per HTTP call).
+
+        Returns the API responses in the order of bodies; failed inserts are
+        returned as the HttpError raised for that event.
+        """
+        logger.info(f'Creating {len(bodies)} calendar events')
+        events = self.cx.events()
+        results = self._execute_batch(
+            (str(i), events.insert(calendarId=calendar_id, body=body, **kw))
+            for i, body in enumerate(bodies))
+        for i, result in results.items():
+            if isinstance(result, HttpError):
+                logger.error(f'Failed to create event {i}: {result}')
+        return [results.get(str(i)) for i in range(len(bodies))]
@@ -1,20 +1,26 @@
 """Google Drive API client for file operations.
 """
+import functools
 import io
 import logging
 import mimetypes
 import os
 import posixpath
 import warnings
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, overload
 
 import cachu
 import filetype
+import httplib2
 from goog.base import Context, RateLimitError, clean_filename, get_settings
-from goog.base import is_rate_limit
+from goog.base import _prefetch_pool, _use_cache_dir, is_rate_limit
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from googleapiclient.http import DEFAULT_CHUNK_SIZE, MediaFileUpload
+from googleapiclient.http import MediaIoBaseDownload
 from googleapiclient.http import MediaIoBaseUpload
 from tqdm import tqdm
 
@@ -22,6 +28,10 @@ logger = logging.getLogger(__name__)
 
 SHARED_DRIVE_EXTRA = {'includeItemsFromAllDrives': True, 'supportsAllDrives': True}
 FOLDER_MIME = 'application/vnd.google-apps.folder'
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+DOWNLOAD_CHUNKSIZE = 1024 * 1024
+MAX_WORKERS = 8
+STREAM_TIMEOUT = 60
 
 GOOGLE_EXPORT_DEFAULTS = {
     'application/vnd.google-apps.document': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
@@ -33,6 +43,8 @@ GOOGLE_EXPORT_DEFAULTS = {
 
 INFO_FIELDS = 'id, name, mimeType, size, createdTime, modifiedTime, parents, webViewLink, trashed'
 SEARCH_FIELDS = f'nextPageToken, files({INFO_FIELDS})'
+FILE_QUERY = "name='%s' and '%s' in parents and trashed=false"
+FOLDER_QUERY = f"name='%s' and mimeType='{FOLDER_MIME}' and '%s' in parents and trashed=false"
 
 CHANGE_FILE_FIELDS = 'id, name, mimeType, size, modifiedTime, parents, trashed'
 CHANGES_FIELDS = (
@@ -40,6 +52,27 @@ CHANGES_FIELDS = (
     f'changes(fileId, removed, time, changeType, driveId, file({CHANGE_FILE_FIELDS}))')
 
 
+def _name_prefix_q(prefix: str) -> str:
+    """Build a Drive name-prefix clause for a files.list query.
+    """
+    return f"name contains '{clean_filename(prefix)}'"
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_segments(path: str) -> tuple[str, ...]:
+    """Normalize and split a path into its non-empty segments.
+    """
+    normalized = path.replace(os.sep, '/') if os.sep != '/' else path
+    return tuple(p for p in posixpath.normpath(normalized).split('/') if p)
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_type(suffixes: str) -> str | None:
+    """Guess a mimetype from a file name's suffix chain (e.g. '.tar.gz').
+    """
+    return mimetypes.guess_type(f'x{suffixes}')[0]
+
+
 class Drive(Context):
     """Google Drive API client for file operations.
     """
@@ -51,9 +84,9 @@ class Drive(Context):
         settings = get_settings()
         self._rootid = settings.get('rootid', {})
         self._tmpdir = settings.get('tmpdir')
-        cache_dir = os.path.join(Path('~').expanduser(), '.cache', 'goog')
-        Path(cache_dir).mkdir(exist_ok=True, parents=True)
-        cachu.configure(backend_default='file', file_dir=cache_dir)
+        self._chainless_roots: set[str] = set()
+        _use_cache_dir(settings.get('cache_dir') or os.path.join(
+            Path('~').expanduser(), '.cache', 'goog'))
 
     def clear_cache(self) -> None:
         """Clear the folder resolution cache.
@@ -64,7 +97,7 @@ class Drive(Context):
     def _normalize_path(self, path: str, trailing_slash: bool = False) -> str:
         """Normalize path to use forward slashes.
         """
-        normalized = path.replace(os.sep, '/')
+        normalized = path.replace(os.sep, '/') if os.sep != '/' else path
         if trailing_slash:
             normalized = posixpath.join(normalized, '')
         return normalized
@@ -72,8 +105,53 @@ class Drive(Context):
     def _split_path(self, path: str) -> list[str]:
         """Split path into component folders.
         """
-        normalized = self._normalize_path(path)
-        return list(filter(len, posixpath.normpath(normalized).split('/')))
+        return list(_split_segments(path))
+
+    def _iter_pages(self, http: Any = None, prefetch: bool = False,
+                    page_token: str | None = None, **params) -> Any:
+        """Yield each files.list response, following nextPageToken.
+
+        pageSize defaults to 1000 and shared drive items are included. With
+        prefetch, the next page is requested on a background thread while
+        the caller consumes the current one. page_token resumes a listing.
+        """
+        params = {'pageSize': 1000, **SHARED_DRIVE_EXTRA, **params}
+        resource = self.cx.files()
+
+        def _fetch(tok: str | None, http: Any = http) -> dict:
+            return resource.list(pageToken=tok, **params).execute(http=http, num_retries=5)
+
+        def _fetch_ahead(tok: str) -> dict:
+            return _fetch(tok, self._thread_http())
+
+        resp = _fetch(page_token)
+        if not prefetch:
+            while True:
+                yield resp
+                tok = resp.get('nextPageToken')
+                if tok is None:
+                    return
+                resp = _fetch(tok)
+        ahead = None
+        try:
+            while True:
+                tok = resp.get('nextPageToken')
+                if tok is None:
+                    yield resp
+                    return
+                ahead = _prefetch_pool().submit(_fetch_ahead, tok)
+                yield resp
+                resp = ahead.result()
+                ahead = None
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+    def _iter_list(self, http: Any = None, **params) -> Any:
+        """Yield each file from a paginated files.list query.
+        """
+        for resp in self._iter_pages(http, **params):
+            yield from resp.get('files', [])
 
     def _check_filepath_usage(self, method_name: str, filepath: str | None,
                               folder: str | None, filename: str | None,
@@ -111,29 +189,18 @@ class Drive(Context):
         except LookupError:
             logger.debug(f'Folder {folder} not found')
             return None
+        return self._find_child_id(folderid, filename)
 
-        clean_name = clean_filename(filename)
-        query = f"name='{clean_name}' and '{folderid}' in parents and trashed=false"
-        page_token = None
-
-        while True:
-            param = dict(
-                q=query,
-                spaces='drive',
-                fields='nextPageToken, files(id, name)',
-                pageToken=page_token,
-                **SHARED_DRIVE_EXTRA,
-            )
-            response = self.cx.files().list(**param).execute(num_retries=5)
-            for f in response['files']:
-                logger.debug(f"Found file: {f['name']}")
-                return f['id']
-
-            page_token = response.get('nextPageToken')
-            if page_token is None:
-                break
-
-        return None
+    def _find_child_id(self, parent_id: str, name: str) -> str | None:
+        """Return the ID of the first untrashed file named name in parent_id.
+        """
+        query = FILE_QUERY % (clean_filename(name), parent_id)
+        f = next(self._iter_list(q=query, spaces='drive', pageSize=1,
+                                 fields='nextPageToken, files(id)'), None)
+        if f is None:
+            return None
+        logger.debug(f'Found file: {name}')
+        return f['id']
 
     @overload
     def delete(self, filepath: str) -> None: ...
@@ -159,18 +226,46 @@ class Drive(Context):
             display_name = filename
 
         self.cx.files().delete(fileId=fileid, supportsAllDrives=True).execute(num_retries=5)
+        self._forget_file(filepath or posixpath.join(folder, filename))
         logger.info(f'Deleted {display_name} from drive')
 
+    def delete_many(self, filepaths: list[str]) -> None:
+        """Permanently delete several files or folders with batched requests.
+
+        Paths are resolved individually (cached), then deleted in batches
+        of up to 100 per HTTP call. Raises the first HttpError after all
+        deletes have been attempted.
+        """
+        fileids = {filepath: self.id(filepath) for filepath in dict.fromkeys(filepaths)}
+        files = self.cx.files()
+        results = self._execute_batch(
+            (filepath, files.delete(fileId=fileid, supportsAllDrives=True))
+            for filepath, fileid in fileids.items())
+        failed = {p: r for p, r in results.items() if isinstance(r, HttpError)}
+        for filepath in results.keys() - failed.keys():
+            self._forget_file(filepath)
+        for filepath, exc in failed.items():
+            logger.error(f'Failed to delete {filepath}: {exc}')
+        logger.info(f'Deleted {len(results) - len(failed)} items from drive')
+        if failed:
+            raise next(iter(failed.values()))
+
     @overload
-    def download(self, filepath: str, directory: str | None = None) -> str | None: ...
+    def download(self, filepath: str, directory: str | None = None, *,
+                 chunksize: int | None = None) -> str | None: ...
 
     @overload
     def download(self, *, folder: str, filename: str,
-                 directory: str | None = None) -> str | None: ...
+                 directory: str | None = None,
+                 chunksize: int | None = None) -> str | None: ...
 
     def download(self, filepath: str | None = None, directory: str | None = None, *,
-                 folder: str | None = None, filename: str | None = None) -> str | None:
+                 folder: str | None = None, filename: str | None = None,
+                 chunksize: int | None = None) -> str | None:
         """Downloads a file from drive location to local directory.
+
+        The body is streamed to disk chunksize bytes at a time (the
+        download_chunksize setting, else 1 MiB).
         """
         self._check_filepath_usage('download', filepath, folder, filename)
 
@@ -191,23 +286,78 @@ class Drive(Context):
                 raise ValueError('directory required when not configured')
 
         topath = posixpath.join(Path(directory).resolve(), fname)
+        self._download_to(fileid, fname, topath, chunksize)
+        return topath
+
+    def _download_to(self, fileid: str, fname: str, topath: str,
+                     chunksize: int | None = None) -> None:
+        """Stream a file's media to a local path.
+        """
         with Path(topath).open('wb') as f:
-            request = self.cx.files().get_media(fileId=fileid)
-            media = MediaIoBaseDownload(f, request)
-            with tqdm(total=100, unit='%', desc=f'Downloading {fname}') as pbar:
-                while True:
-                    try:
-                        status, done = media.next_chunk()
-                    except Exception:
-                        logger.exception(f'Download failed for {fname}')
-                        raise
-                    if status:
-                        pbar.update(int(status.progress() * 100) - pbar.n)
-                    if done:
-                        pbar.update(100 - pbar.n)
-                        break
-            logger.info(f'Downloaded file {fname}')
-            return topath
+            try:
+                self._stream_media(fileid, f, f'Downloading {fname}', chunksize)
+            except Exception:
+                logger.exception(f'Download failed for {fname}')
+                raise
+        logger.info(f'Downloaded file {fname}')
+
+    def _stream_media(self, fileid: str, fh: Any, desc: str,
+                      chunksize: int | None = None) -> None:
+        """Copy a file's media into fh as it arrives from the socket.
+
+        Runs on the calling thread's AuthorizedSession, so memory stays at
+        one chunksize read instead of a whole MediaIoBaseDownload chunk.
+        """
+        uri = self.cx.files().get_media(fileId=fileid).uri
+        with self._thread_session().get(uri, stream=True, timeout=STREAM_TIMEOUT) as resp:
+            if resp.status_code >= 400:
+                raise HttpError(httplib2.Response({'status': resp.status_code}),
+                                resp.content, uri=uri)
+            total = int(resp.headers.get('content-length', 0)) or None
+            with tqdm(total=total, unit='B', unit_scale=True, desc=desc, disable=None) as pbar:
+                for chunk in resp.iter_content(chunk_size=self._chunksize(chunksize)):
+                    fh.write(chunk)
+                    pbar.update(len(chunk))
+
+    def download_many(self, filepaths: list[str], directory: str | None = None,
+                      max_workers: int | None = None,
+                      chunksize: int | None = None) -> dict[str, str]:
+        """Download several files concurrently to a local directory.
+
+        Paths are resolved on the calling thread (cached), then streamed on
+        a thread pool with one session per worker. Returns a mapping of drive
+        path to local path; the first failure is raised after all downloads
+        have finished. max_workers defaults to the max_workers setting, else 8.
+        Paths sharing a file name raise ValueError before anything is fetched.
+        """
+        if directory is None:
+            directory = self._tmpdir
+            if directory is None:
+                raise ValueError('directory required when not configured')
+        directory = Path(directory).resolve()
+        seen = {}
+        for filepath in dict.fromkeys(filepaths):
+            fname = Path(filepath).name
+            if fname in seen:
+                raise ValueError(f'{seen[fname]} and {filepath} would both download to {fname}')
+            seen[fname] = filepath
+        targets = {}
+        for fname, filepath in seen.items():
+            targets[filepath] = (self.id(filepath), fname, posixpath.join(directory, fname))
+
+        def _fetch(fileid: str, fname: str, topath: str) -> None:
+            self._download_to(fileid, fname, topath, chunksize)
+
+        max_workers = max_workers or get_settings().get('max_workers', MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_fetch, *target): filepath
+                       for filepath, target in targets.items()}
+        failed = [(futures[f], f.exception()) for f in futures if f.exception()]
+        for filepath, exc in failed:
+            logger.error(f'Failed to download {filepath}: {exc}')
+        if failed:
+            raise failed[0][1]
+        return {filepath: target[2] for filepath, target in targets.items()}
 
     @overload
     def read(self, filepath: str, **kw) -> io.BytesIO: ...
@@ -220,8 +370,12 @@ class Drive(Context):
 
     def read(self, filepath: str | None = None, *,
              folder: str | None = None, filename: str | None = None,
-             file_id: str | None = None, **kw) -> io.BytesIO:
+             file_id: str | None = None, chunksize: int | None = None,
+             out: io.BytesIO | None = None, **kw) -> io.BytesIO:
         """Opens file from drive location as a buffered i/o stream.
+
+        Pass out to reuse a buffer across reads; it is emptied, filled and
+        returned rewound instead of allocating a new BytesIO.
         """
         self._check_filepath_usage('read', filepath, folder, filename, file_id)
 
@@ -240,17 +394,13 @@ class Drive(Context):
                 raise LookupError(f'{filename} not found in {folder}')
             fname = filename
 
-        s = io.BytesIO()
-        request = self.cx.files().get_media(fileId=fileid)
-        media = MediaIoBaseDownload(s, request)
-        with tqdm(total=100, unit='%', desc=f'Reading {fname}') as pbar:
-            while True:
-                status, done = media.next_chunk()
-                if status:
-                    pbar.update(int(status.progress() * 100) - pbar.n)
-                if done:
-                    pbar.update(100 - pbar.n)
-                    break
+        if out is None:
+            s = io.BytesIO()
+        else:
+            s = out
+            s.seek(0)
+            s.truncate()
+        self._stream_media(fileid, s, f'Reading {fname}', chunksize)
         logger.info(f'Downloaded file {fname}')
         s.seek(0)
         return s
@@ -305,7 +455,7 @@ class Drive(Context):
         request = self.cx.files().export_media(
             fileId=fileid, mimeType=mime_type)
         media = MediaIoBaseDownload(s, request)
-        with tqdm(total=100, unit='%', desc=f'Exporting {fname}') as pbar:
+        with tqdm(total=100, unit='%', desc=f'Exporting {fname}', disable=None) as pbar:
             while True:
                 status, done = media.next_chunk()
                 if status:
@@ -317,11 +467,27 @@ class Drive(Context):
         s.seek(0)
         return s
 
+    def _chunksize(self, chunksize: int | None) -> int:
+        """Resolve the streamed download read size from argument or settings.
+        """
+        if chunksize:
+            return chunksize
+        return get_settings().get('download_chunksize') or DOWNLOAD_CHUNKSIZE
+
     def walk(self, folder: str = '/', recursive: bool = False,
              links: bool = False, ctime: bool = False, mtime: bool = False,
              since: str | None = None, exclude_trashed: bool = True,
-             detail: bool = False, flat: bool = False) -> Any:
+             detail: bool = False, flat: bool = False,
+             max_workers: int = 1, name_prefix: str | None = None) -> Any:
         """List files in Drive folder by path, optionally recursive.
+
+        Folders are listed breadth-first, with each folder's next page
+        fetched in the background while the current one is consumed. With
+        max_workers > 1, pages of all pending folders are listed concurrently
+        on a thread pool and results are yielded as each page arrives, so
+        output order is not stable. name_prefix is applied by Drive (name contains,
+        which matches the prefix of the name or of its words) to files only,
+        so subfolders are still descended.
         """
         if detail:
             ctime = True
@@ -331,9 +497,11 @@ class Drive(Context):
                 folder, detail=detail,
                 exclude_trashed=exclude_trashed,
                 links=links, ctime=ctime, mtime=mtime,
-                since=since)
+                since=since, name_prefix=name_prefix)
             return
-        _fields = ['id', 'name', 'mimeType']
+        _fields = ['id', 'name']
+        if recursive or detail:
+            _fields.append('mimeType')
         if links:
             _fields.append('webContentLink')
         if ctime:
@@ -341,45 +509,86 @@ class Drive(Context):
         if mtime:
             _fields.append('modifiedTime')
         fields = f"nextPageToken, files({', '.join(_fields)})"
-        folderid = self.id(folder)
-        q = f"'{folderid}' in parents"
+        q_filter = ''
         if since:
-            q = f'{q} and modifiedTime>={since}'
+            q_filter = f'{q_filter} and modifiedTime>={since}'
         if exclude_trashed:
-            q = f'{q} and trashed=false'
-        tok = None
-        while True:
-            param = dict(q=q, fields=fields, pageToken=tok,
-                         pageSize=1000, **SHARED_DRIVE_EXTRA)
-            resp = self.cx.files().list(**param).execute(num_retries=5)
-            files = resp['files']
-            logger.info(f'Returned {len(files)} items from {folder}')
-            for f in files:
-                filepath = posixpath.join(folder, f['name'])
-                is_folder = f['mimeType'] == FOLDER_MIME
-                if is_folder and recursive:
-                    yield from self.walk(
-                        filepath, recursive=True, links=links,
-                        ctime=ctime, mtime=mtime, since=since,
-                        exclude_trashed=exclude_trashed, detail=detail)
-                elif not is_folder:
-                    if detail:
-                        entry = {'path': filepath, 'id': f['id'],
-                                 'name': f['name'], 'mimeType': f['mimeType']}
-                        if links:
-                            entry['webContentLink'] = f.get('webContentLink')
-                        if ctime:
-                            entry['createdTime'] = f.get('createdTime')
-                        if mtime:
-                            entry['modifiedTime'] = f.get('modifiedTime')
-                        yield entry
-                    else:
-                        yield filepath
-            tok = resp.get('nextPageToken')
-            if tok is None:
+            q_filter = f'{q_filter} and trashed=false'
+        if not recursive:
+            q_filter = f"{q_filter} and mimeType!='{FOLDER_MIME}'"
+        if name_prefix and recursive:
+            q_filter = f"{q_filter} and ({_name_prefix_q(name_prefix)} or mimeType='{FOLDER_MIME}')"
+        elif name_prefix:
+            q_filter = f'{q_filter} and {_name_prefix_q(name_prefix)}'
+
+        def _entry(filepath: str, f: dict) -> Any:
+            if not detail:
+                return filepath
+            entry = {'path': filepath, 'id': f['id'],
+                     'name': f['name'], 'mimeType': f['mimeType']}
+            if links:
+                entry['webContentLink'] = f.get('webContentLink')
+            if ctime:
+                entry['createdTime'] = f.get('createdTime')
+            if mtime:
+                entry['modifiedTime'] = f.get('modifiedTime')
+            return entry
+
+        def _walk_serial(root_path: str, root_id: str) -> Any:
+            queue = deque([(root_path, root_id)])
+            while queue:
+                path, folderid = queue.popleft()
+                q = f"'{folderid}' in parents{q_filter}"
+                for resp in self._iter_pages(prefetch=True, q=q, fields=fields):
+                    files = resp['files']
+                    logger.info(f'Returned {len(files)} items from {path}')
+                    if exclude_trashed:
+                        self._cache_segments(folderid, files)
+                        self._cache_files(path, files)
+                    for f in files:
+                        filepath = posixpath.join(path, f['name'])
+                        if f.get('mimeType') != FOLDER_MIME:
+                            yield _entry(filepath, f)
+                        elif recursive:
+                            queue.append((filepath, f['id']))
+            logger.info('No more items, exiting')
+
+        def _list_page(folderid: str, tok: str | None) -> dict:
+            q = f"'{folderid}' in parents{q_filter}"
+            return next(self._iter_pages(self._thread_http(), page_token=tok,
+                                         q=q, fields=fields))
+
+        def _walk_parallel(root_path: str, root_id: str) -> Any:
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                pending = {pool.submit(_list_page, root_id, None): (root_path, root_id)}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        path, folderid = pending.pop(finished)
+                        resp = finished.result()
+                        if tok := resp.get('nextPageToken'):
+                            pending[pool.submit(_list_page, folderid, tok)] = (path, folderid)
+                        files = resp['files']
+                        logger.info(f'Returned {len(files)} items from {path}')
+                        if exclude_trashed:
+                            self._cache_segments(folderid, files)
+                            self._cache_files(path, files)
+                        for f in files:
+                            child_path = posixpath.join(path, f['name'])
+                            if f.get('mimeType') != FOLDER_MIME:
+                                yield _entry(child_path, f)
+                            elif recursive:
+                                child = pool.submit(_list_page, f['id'], None)
+                                pending[child] = (child_path, f['id'])
                 logger.info('No more items, exiting')
-                break
-            logger.debug('Next page token, continuing')
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        if max_workers > 1:
+            yield from _walk_parallel(folder, self.id(folder))
+        else:
+            yield from _walk_serial(folder, self.id(folder))
 
     def _walk_flat(
         self, folder: str = '/',
@@ -389,6 +598,7 @@ class Drive(Context):
         ctime: bool = False,
         mtime: bool = False,
         since: str | None = None,
+        name_prefix: str | None = None,
     ) -> Any:
         """List all files under folder via flat drive-wide scan.
 
@@ -411,8 +621,9 @@ class Drive(Context):
             q_parts.append('trashed=false')
         if since:
             q_parts.append(f"modifiedTime>='{since}'")
+        if name_prefix:
+            q_parts.append(f"({_name_prefix_q(name_prefix)} or mimeType='{FOLDER_MIME}')")
         q = ' and '.join(q_parts) if q_parts else None
-        tok = None
         _file_fields = ['id', 'name', 'mimeType', 'parents']
         if links:
             _file_fields.append('webContentLink')
@@ -422,28 +633,19 @@ class Drive(Context):
             _file_fields.append('modifiedTime')
         fields = f"nextPageToken, files({', '.join(_file_fields)})"
         total_fetched = 0
-        while True:
-            param: dict[str, Any] = dict(
-                fields=fields, pageToken=tok, pageSize=1000,
-                **SHARED_DRIVE_EXTRA)
-            if drive_id:
-                param['corpora'] = 'drive'
-                param['driveId'] = drive_id
-            if q:
-                param['q'] = q
-            resp = self.cx.files().list(**param).execute(
-                num_retries=5)
-            page = resp.get('files', [])
-            total_fetched += len(page)
-            for f in page:
-                parent = (f.get('parents') or [None])[0]
-                if f['mimeType'] == FOLDER_MIME:
-                    folder_map[f['id']] = (f['name'], parent)
-                else:
-                    files.append(f)
-            tok = resp.get('nextPageToken')
-            if tok is None:
-                break
+        param: dict[str, Any] = {'fields': fields}
+        if drive_id:
+            param['corpora'] = 'drive'
+            param['driveId'] = drive_id
+        if q:
+            param['q'] = q
+        for f in self._iter_list(**param):
+            total_fetched += 1
+            parent = (f.get('parents') or [None])[0]
+            if f['mimeType'] == FOLDER_MIME:
+                folder_map[f['id']] = (f['name'], parent)
+            else:
+                files.append(f)
         logger.info(
             f'walk(flat): {len(files)} files, '
             f'{len(folder_map)} folders '
@@ -507,6 +709,7 @@ class Drive(Context):
             clauses.append('trashed=false')
         q = ' and '.join(clauses) if clauses else None
 
+        files = self.cx.files()
         results = []
         tok = None
         while len(results) < limit:
@@ -514,7 +717,7 @@ class Drive(Context):
             param = dict(
                 q=q, fields=SEARCH_FIELDS, pageToken=tok,
                 pageSize=page_size, **SHARED_DRIVE_EXTRA)
-            resp = self.cx.files().list(**param).execute(num_retries=5)
+            resp = files.list(**param).execute(num_retries=5)
             for f in resp.get('files', []):
                 results.append(f)
                 if len(results) >= limit:
@@ -574,7 +777,7 @@ class Drive(Context):
         logger.info(f'Listed {len(changes)} total changes')
         return changes, new_token
 
-    @cachu.cache(ttl=1800, tag='folders', package='goog',
+    @cachu.cache(ttl=1800, backend='file', tag='folders', package='goog',
                  cache_if=lambda r: r is not None)
     def _resolve_parent(self, folder_id: str) -> tuple[str, str | None] | None:
         """Resolve a folder ID to (name, parent_id).
@@ -676,6 +879,8 @@ class Drive(Context):
     def move(self, filepath: str | None = None, to_folder: str | None = None, *,
              folder: str | None = None, filename: str | None = None) -> None:
         """Move file or folder to a new parent folder.
+
+        A moved file's cached id follows it to the destination path.
         """
         self._check_filepath_usage('move', filepath, folder, filename)
 
@@ -695,18 +900,22 @@ class Drive(Context):
                 raise LookupError(f'{filename} not found in {folder}')
 
         to_folderid = self.id(to_folder)
-        param = {'fileId': fileid, 'fields': 'parents', 'supportsAllDrives': True}
+        param = {'fileId': fileid, 'fields': 'parents, mimeType', 'supportsAllDrives': True}
         oldfile = self.cx.files().get(**param).execute(num_retries=5)
         previous_folders = ','.join(oldfile.get('parents'))
         param = {
             'fileId': fileid,
             'addParents': to_folderid,
             'removeParents': previous_folders,
-            'fields': 'id, parents',
+            'fields': 'id',
             'supportsAllDrives': True,
         }
         self.cx.files().update(**param).execute(num_retries=5)
-        self.clear_cache()
+        if oldfile.get('mimeType') == FOLDER_MIME:
+            self.clear_cache()
+        else:
+            self._forget_file(filepath or posixpath.join(folder, filename))
+            self._cache_files(to_folder, [{'id': fileid, 'name': fname}])
         logger.info(f'Moved {fname} to Drive folder {to_folder}')
 
     @overload
@@ -757,56 +966,158 @@ class Drive(Context):
 
     def write(self, filepath_or_data: str | bytes | io.IOBase, fname: str, folder: str,
               mimetype: str | None = None, overwrite: bool = True,
-              mkdir_p: bool = False) -> None:
+              mkdir_p: bool = False, chunksize: int | None = None,
+              progress: Callable[[int, int | None], None] | None = None,
+              default_mimetype: str | None = None) -> None:
         """Write file to Google Drive.
+
+        Payloads smaller than the resumable_threshold setting (5 MiB by
+        default) are sent in a single multipart request; larger payloads
+        and unseekable file objects use a resumable upload in chunksize pieces
+        (upload_chunksize setting, else the client library default).
+        Resumable uploads report to progress(bytes_sent, total_bytes) when
+        given, otherwise to a tqdm bar drawn only when stderr is a TTY. The
+        mimetype is guessed from the extension of fname, then from the header
+        of a local filepath; default_mimetype is used when both fail.
         """
         self._validate_folder(folder)
-        filepath, data = None, None
-        if isinstance(filepath_or_data, str):
-            if Path(filepath_or_data).is_dir():
-                raise AttributeError(f'{filepath_or_data} is a diretory, not a file')
-            if not Path(filepath_or_data).is_file():
-                raise AttributeError(f'Cannot verify `isfile` against {filepath_or_data}')
-            filepath = filepath_or_data
-        else:
-            data = filepath_or_data
-        if not mimetype:
-            mimetype, _ = mimetypes.guess_type(fname)
+        filepath, data = self._upload_source(filepath_or_data)
+        mimetype = self._guess_mimetype(fname, filepath, mimetype, default_mimetype)
+        folderid = self.makedirs(folder) if mkdir_p else self.id(folder)
+        self._protect(posixpath.join(folder, fname), overwrite)
+        done = self._upload_one(filepath, data, fname, folderid, mimetype,
+                                chunksize, progress)
+        logger.info(f"Wrote file: {done['name']} id: {done['id']} to Drive {folder}")
+
+    def write_many(self, items: list[tuple[str | bytes | io.IOBase, str, str]],
+                   mimetype: str | None = None, overwrite: bool = True,
+                   mkdir_p: bool = False, max_workers: int | None = None,
+                   chunksize: int | None = None,
+                   default_mimetype: str | None = None) -> dict[str, str]:
+        """Upload several (filepath_or_data, fname, folder) items concurrently.
+
+        Folders are resolved (or created with mkdir_p) once each and existing
+        files checked on the calling thread; uploads then run on a thread
+        pool with one http connection per worker. Returns a mapping of drive
+        path to new file id; the first failure is raised after all uploads
+        have finished. max_workers defaults to the max_workers setting, else 8.
+        """
+        folderids = {}
+        uploads = {}
+        for filepath_or_data, fname, folder in items:
+            if folder not in folderids:
+                self._validate_folder(folder)
+                folderids[folder] = self.makedirs(folder) if mkdir_p else self.id(folder)
+            filepath, data = self._upload_source(filepath_or_data)
+            mime = self._guess_mimetype(fname, filepath, mimetype, default_mimetype)
+            to_filepath = posixpath.join(folder, fname)
+            self._protect(to_filepath, overwrite)
+            uploads[to_filepath] = (filepath, data, fname, folderids[folder], mime)
+
+        def _put(filepath, data, fname, folderid, mime) -> dict:
+            return self._upload_one(filepath, data, fname, folderid, mime, chunksize,
+                                    progress=lambda *_: None, http=self._thread_http())
+
+        max_workers = max_workers or get_settings().get('max_workers', MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_put, *upload): to_filepath
+                       for to_filepath, upload in uploads.items()}
+        failed = [(futures[f], f.exception()) for f in futures if f.exception()]
+        for to_filepath, exc in failed:
+            logger.error(f'Failed to write {to_filepath}: {exc}')
+        if failed:
+            raise failed[0][1]
+        written = {futures[f]: f.result()['id'] for f in futures}
+        logger.info(f'Wrote {len(written)} files to Drive')
+        return written
+
+    def _upload_source(self, filepath_or_data: str | bytes | io.IOBase
+                       ) -> tuple[str | None, bytes | io.IOBase | None]:
+        """Split a write() source into a verified local filepath or in-memory data.
+        """
+        if not isinstance(filepath_or_data, str):
+            return None, filepath_or_data
+        if Path(filepath_or_data).is_dir():
+            raise AttributeError(f'{filepath_or_data} is a diretory, not a file')
+        if not Path(filepath_or_data).is_file():
+            raise AttributeError(f'Cannot verify `isfile` against {filepath_or_data}')
+        return filepath_or_data, None
+
+    def _guess_mimetype(self, fname: str, filepath: str | None,
+                        mimetype: str | None = None,
+                        default_mimetype: str | None = None) -> str:
+        """Resolve the upload mimetype from fname, then the local file header.
+        """
         if not mimetype:
+            mimetype = _guess_type(''.join(Path(fname).suffixes))
+        if not mimetype and filepath:
             logger.warning(f'Unable to guess mimetype of file name {fname}, trying again')
             mimetype = filetype.guess_mime(filepath)
+        mimetype = mimetype or default_mimetype
         if not mimetype:
             raise ValueError(f'Cannot resolve mimetype from {fname} and {filepath}')
-        to_filepath = posixpath.join(folder, fname)
-        self._protect(to_filepath, overwrite)
-        if mkdir_p and not self.exists(folder):
-            folderid = self.makedirs(folder)
-        else:
-            folderid = self.id(folder)
+        return mimetype
+
+    def _upload_one(self, filepath: str | None, data: bytes | io.IOBase | None,
+                    fname: str, folderid: str, mimetype: str,
+                    chunksize: int | None = None,
+                    progress: Callable[[int, int | None], None] | None = None,
+                    http: Any = None) -> dict:
+        """Upload one file into a resolved folder and return the created metadata.
+
+        Worker threads pass their own http, since httplib2 connections are
+        not thread-safe.
+        """
+        settings = get_settings()
+        threshold = settings.get('resumable_threshold', RESUMABLE_THRESHOLD)
+        chunksize = chunksize or settings.get('upload_chunksize') or DEFAULT_CHUNK_SIZE
         if data:
             if isinstance(data, io.IOBase):
-                s = data
+                s, resumable = data, True
+                if data.seekable():
+                    pos = data.tell()
+                    resumable = data.seek(0, io.SEEK_END) - pos >= threshold
+                    data.seek(pos)
             else:
-                s = io.BytesIO()
-                s.write(data)
-            media = MediaIoBaseUpload(s, mimetype=mimetype, resumable=True)
+                s, resumable = io.BytesIO(data), len(data) >= threshold
+            media = MediaIoBaseUpload(s, mimetype=mimetype, chunksize=chunksize,
+                                      resumable=resumable)
         else:
-            media = MediaFileUpload(filepath, mimetype=mimetype, resumable=True)
+            resumable = Path(filepath).stat().st_size >= threshold
+            media = MediaFileUpload(filepath, mimetype=mimetype, chunksize=chunksize,
+                                    resumable=resumable)
         meta = {'name': fname, 'parents': [folderid]}
         request = self.cx.files().create(media_body=media, body=meta, supportsAllDrives=True)
+        if http is not None:
+            request.http = http
+        if not resumable:
+            return request.execute(num_retries=5)
         response = None
-        with tqdm(total=100, unit='%', desc=f'Uploading {fname}') as pbar:
+        if progress is not None:
             while response is None:
                 status, response = request.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    pbar.update(progress - pbar.n)
+                if status is not None:
+                    progress(status.resumable_progress, status.total_size)
+            size = media.size()
+            progress(size, size)
+            return response
+        with tqdm(total=100, unit='%', desc=f'Uploading {fname}', disable=None) as pbar:
+            while response is None:
+                status, response = request.next_chunk()
+                if status is None:
+                    continue
+                pct = int(status.progress() * 100)
+                if pct > pbar.n:
+                    pbar.update(pct - pbar.n)
             pbar.update(100 - pbar.n)
-        done = response
-        logger.info(f"Wrote file: {done['name']} id: {done['id']} to Drive {folder}")
+        return response
 
     def makedirs(self, folder: str) -> str:
         """Create folder path recursively (like mkdir -p), returning the final folder ID.
+
+        Once a segment has to be created, its descendants cannot exist yet,
+        so their lookups are skipped. New folders are added to the segment
+        cache rather than clearing it.
         """
         self._validate_folder(folder)
         folders = self._split_path(folder)
@@ -816,45 +1127,36 @@ class Drive(Context):
             raise LookupError(f'Unknown Shared Drive {root}')
         parent_id = rootid
         current_path = f'/{root}'
+        creating = False
+        files = self.cx.files()
         for subfolder in subfolders:
             current_path = posixpath.join(current_path, subfolder)
-            segment_id = self._resolve_segment(parent_id, subfolder)
-            if segment_id:
-                parent_id = segment_id
-                logger.debug(f'Folder {current_path} already exists')
-                continue
+            if not creating:
+                segment_id = self._resolve_segment(parent_id, subfolder)
+                if segment_id:
+                    parent_id = segment_id
+                    logger.debug(f'Folder {current_path} already exists')
+                    continue
+                creating = True
             meta = {
                 'name': subfolder,
                 'mimeType': FOLDER_MIME,
                 'parents': [parent_id]
             }
-            created = self.cx.files().create(body=meta,
-                                             supportsAllDrives=True,
-                                             fields='id').execute(num_retries=5)
+            created = files.create(body=meta, supportsAllDrives=True,
+                                   fields='id').execute(num_retries=5)
+            cachu.cache_set(type(self)._resolve_segment, created['id'],
+                            parent_id=parent_id, segment=subfolder)
             parent_id = created['id']
             logger.info(f'Created folder {current_path} with id {parent_id}')
-        self.clear_cache()
         return parent_id
 
     def _list_children(self, folder_id: str) -> list[dict[str, Any]]:
         """List all children (files and folders) of a folder by ID.
         """
         q = f"'{folder_id}' in parents and trashed=false"
-        results = []
-        tok = None
-        while True:
-            param = dict(
-                q=q,
-                fields='nextPageToken, files(id, name, mimeType)',
-                pageToken=tok,
-                **SHARED_DRIVE_EXTRA,
-                )
-            resp = self.cx.files().list(**param).execute(num_retries=5)
-            results.extend(resp.get('files', []))
-            tok = resp.get('nextPageToken')
-            if tok is None:
-                break
-        return results
+        return list(self._iter_list(
+            q=q, fields='nextPageToken, files(id, name, mimeType)'))
 
     def move_tree(self, folder: str, to_folder: str) -> None:
         """Move a folder's contents to a new location, creating destination as needed.
@@ -893,13 +1195,15 @@ class Drive(Context):
             child_path = posixpath.join(folder, subfolder['name'])
             self.move_tree(child_path, dest_path)
 
-        for f in tqdm(files, desc=f'Moving {folder_name}', unit='file', leave=False):
+        resource = self.cx.files()
+        for f in tqdm(files, desc=f'Moving {folder_name}', unit='file', leave=False,
+                      disable=None):
             try:
-                self.cx.files().update(
+                resource.update(
                     fileId=f['id'],
                     addParents=dest_id,
                     removeParents=src_folder_id,
-                    fields='id, parents',
+                    fields='id',
                     supportsAllDrives=True,
                     ).execute(num_retries=5)
             except HttpError as exc:
@@ -921,7 +1225,7 @@ class Drive(Context):
         """
         if not folder:
             return
-        folders = self._split_path(folder)
+        folders = _split_segments(folder)
         if not folders:
             return
         base = folders[0]
@@ -932,16 +1236,17 @@ class Drive(Context):
         """Prevent overwrite of existing file unless explicitly allowed.
         """
         try:
-            self.id(filepath)
+            fileid = self.id(filepath)
         except LookupError:
             return
         if overwrite:
             logger.info(f'Overwriting existing {filepath}')
-            self.delete(filepath)
+            self.cx.files().delete(fileId=fileid, supportsAllDrives=True).execute(num_retries=5)
+            self._forget_file(filepath)
             return
         raise FileExistsError(f'{filepath} already exists')
 
-    @cachu.cache(ttl=300, tag='files', package='goog',
+    @cachu.cache(ttl=300, backend='file', tag='files', package='goog',
                  cache_if=lambda r: r is not None)
     def _resolve_fileid(self, filepath: str) -> str | None:
         """Resolve file ID from filepath.
@@ -951,67 +1256,147 @@ class Drive(Context):
         folderid = self._resolve_folderid(folder)
         if folderid is None:
             return None
-        fname = clean_filename(fname)
-        query = f"name='{fname}' and '{folderid}' in parents and trashed=false"
-        page_token = None
-        while True:
-            param = dict(
-                q=query,
-                spaces='drive',
-                fields='nextPageToken, files(id, name)',
-                pageToken=page_token,
-                **SHARED_DRIVE_EXTRA,
-            )
-            response = self.cx.files().list(**param).execute(num_retries=5)
-            for f in response['files']:
-                logger.debug(f"Found file: {f['name']}")
-                return f['id']
-            page_token = response.get('nextPageToken', None)
-            if page_token is None:
-                break
+        return self._find_child_id(folderid, fname)
+
+    def _cache_segments(self, parent_id: str, children: list[dict[str, Any]]) -> None:
+        """Seed the folder segment cache from an already fetched listing.
+        """
+        seen = set()
+        for f in children:
+            if f.get('mimeType') != FOLDER_MIME or f['name'] in seen:
+                continue
+            seen.add(f['name'])
+            cachu.cache_set(self._resolve_segment, f['id'],
+                            parent_id=parent_id, segment=f['name'])
+
+    def _cache_files(self, path: str, children: list[dict[str, Any]]) -> None:
+        """Seed the file id cache from an already fetched listing of path.
+
+        Lets id() on paths yielded by walk() skip the per-file lookup.
+        """
+        seen = set()
+        for f in children:
+            if f.get('mimeType') == FOLDER_MIME or f['name'] in seen:
+                continue
+            seen.add(f['name'])
+            filepath = self._normalize_path(posixpath.join(path, f['name']))
+            cachu.cache_set(self._resolve_fileid, f['id'], filepath=filepath)
+
+    def _forget_file(self, filepath: str) -> None:
+        """Drop a cached file id after the file is removed.
+
+        If the path was also cached as a folder, the folder caches are
+        cleared too, since paths below it may be memoized.
+        """
+        filepath = self._normalize_path(filepath)
+        cachu.cache_delete(self._resolve_fileid, filepath=filepath)
+        if len(_split_segments(filepath)) > 1 and self._cached_folderid(filepath):
+            self.clear_cache()
 
-    @cachu.cache(ttl=1800, tag='folders', package='goog',
+    def _cached_folderid(self, folderpath: str) -> str | None:
+        """Resolve a folder path from the root and segment caches only.
+
+        Returns None on any uncached segment without calling the API.
+        """
+        root, *segments = _split_segments(folderpath)
+        folderid = self._rootid.get(root)
+        for segment in segments:
+            if folderid is None:
+                return None
+            folderid = cachu.cache_get(self._resolve_segment, None,
+                                       parent_id=folderid, segment=segment)
+        return folderid
+
+    def _prefetch_chain(self, drive_id: str, parent_id: str, names: list[str]) -> None:
+        """Seed the segment cache for a chain of folder names with one listing.
+
+        Lists every folder in the shared drive named like any segment, then
+        follows parents in memory from parent_id. Stops at the first missing
+        or ambiguous name, leaving the rest to per-segment lookups. A root
+        the listing rejects (not a shared drive) is remembered and skipped.
+        """
+        names_q = ' or '.join(f"name='{clean_filename(n)}'" for n in dict.fromkeys(names))
+        q = f"mimeType='{FOLDER_MIME}' and trashed=false and ({names_q})"
+        children: dict[tuple[str, str], list[str]] = {}
+        try:
+            for f in self._iter_list(q=q, corpora='drive', driveId=drive_id,
+                                     fields='nextPageToken, files(id, name, parents)'):
+                for parent in f.get('parents', []):
+                    children.setdefault((parent, f['name']), []).append(f['id'])
+        except HttpError as exc:
+            logger.debug(f'Chain lookup unavailable for {drive_id}: {exc}')
+            if exc.resp.status < 500 and not is_rate_limit(exc):
+                self._chainless_roots.add(drive_id)
+            return
+        for name in names:
+            ids = children.get((parent_id, name), [])
+            if len(ids) != 1:
+                return
+            cachu.cache_set(self._resolve_segment, ids[0], parent_id=parent_id, segment=name)
+            parent_id = ids[0]
+
+    def prefetch_children(self, folder: str, include_files: bool = False) -> int:
+        """Cache the IDs of all subfolders of a folder with one listing.
+
+        Later id()/exists()/write() calls on paths below the folder resolve
+        the next segment from the cache instead of one query per name.
+        With include_files, the folder's files are listed too and their ids
+        cached for id()/download()/delete(). Returns the number of entries
+        cached.
+        """
+        folderid = self.id(folder)
+        q = f"'{folderid}' in parents and trashed=false"
+        if not include_files:
+            q = f"{q} and mimeType='{FOLDER_MIME}'"
+        children = list(self._iter_list(
+            q=q, fields='nextPageToken, files(id, name, mimeType)'))
+        self._cache_segments(folderid, children)
+        if include_files:
+            self._cache_files(folder, children)
+        logger.debug(f'Cached {len(children)} children of {folder}')
+        return len(children)
+
+    @cachu.cache(ttl=1800, backend='file', tag='folders', package='goog',
                  cache_if=lambda r: r is not None)
     def _resolve_segment(self, parent_id: str, segment: str) -> str | None:
         """Resolve a single folder segment within a parent folder.
         """
-        q = f"name='{segment}' and mimeType='{FOLDER_MIME}' and '{parent_id}' in parents and trashed=false"
-        tok = None
-        while True:
-            param = dict(
-                q=q,
-                spaces='drive',
-                fields='nextPageToken, files(id, name)',
-                pageToken=tok,
-                **SHARED_DRIVE_EXTRA,
-            )
-            resp = self.cx.files().list(**param).execute(num_retries=5)
-            for f in resp['files']:
-                logger.info(f"Found folder: {f['name']}")
-                return f['id']
-            if resp.get('nextPageToken') is None:
-                break
-            tok = resp['nextPageToken']
-        return None
+        q = FOLDER_QUERY % (clean_filename(segment), parent_id)
+        f = next(self._iter_list(q=q, spaces='drive', pageSize=1,
+                                 fields='nextPageToken, files(id)'), None)
+        if f is None:
+            return None
+        logger.info(f'Found folder: {segment}')
+        return f['id']
 
+    @cachu.cache(ttl=1800, backend='memory', tag='folders', package='goog',
+                 cache_if=lambda r: r is not None)
     def _resolve_folderid(self, folderpath: str) -> str | None:
         """Resolve folder ID by walking from root down to target folder.
+
+        Whole paths are memoized in memory on top of the per-segment cache,
+        so repeat lookups skip both the API and the file cache backend.
         """
         folder, _ = os.path.split(folderpath)
-        folder = self._normalize_path(folder, trailing_slash=True)
-        self._validate_folder(folder)
+        segments = _split_segments(folder) if folder else ()
+        if segments and segments[0] not in self._rootid:
+            raise LookupError(f'Unknown Shared Drive {segments[0]}')
 
-        if not folder or folder == '/' or folder.replace('/', '') in self._rootid:
+        if len(segments) <= 1:
             logger.debug('Searching root path...')
-            if folder:
-                folder = folder.replace('/', '')
-            return self._rootid.get(folder)
+            return self._rootid.get(segments[0] if segments else '')
 
-        segments = self._split_path(folder)
         root, *remaining = segments
         folderid = self._rootid.get(root)
 
-        for segment in remaining:
+        prefetched = False
+        for i, segment in enumerate(remaining):
+            if (not prefetched and len(remaining) - i > 1
+                    and self._rootid[root] not in self._chainless_roots
+                    and cachu.cache_get(self._resolve_segment, None,
+                                        parent_id=folderid, segment=segment) is None):
+                self._prefetch_chain(self._rootid[root], folderid, remaining[i:])
+                prefetched = True
             folderid = self._resolve_segment(folderid, segment)
             if folderid is None:
                 logger.debug(f'Could not locate folder {segment}')
@@ -1027,13 +1412,13 @@ class Drive(Context):
         folder, fname = os.path.split(filepath)
 
         if fname:
+            folderid = self._cached_folderid(filepath)
+            if folderid:
+                return folderid
+            # the file query matches folders too, so a miss is final
             fileid = self._resolve_fileid(filepath)
             if fileid:
                 return fileid
-            folderid = self._resolve_folderid(
-                self._normalize_path(filepath, trailing_slash=True))
-            if folderid:
-                return folderid
             raise LookupError(f'No such file or folder {filepath}')
 
         folder = self._normalize_path(folder, trailing_slash=True)
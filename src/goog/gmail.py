@@ -2,24 +2,33 @@
 """
 import base64
 import email
+import io
 import logging
 from collections.abc import Generator
+from email import encoders
 from email.mime.audio import MIMEAudio
 from email.mime.base import MIMEBase
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import filetype
 from apiclient import errors
-from goog.base import Context, get_settings
+from goog.base import Context, _prefetch_pool, get_settings
+from googleapiclient.http import DEFAULT_CHUNK_SIZE, MediaIoBaseUpload
 
 import mail
 
 logger = logging.getLogger(__name__)
 
+GMAIL_BATCH_LIMIT = 50
+METADATA_HEADERS = ['From', 'Subject', 'Date']
+SNIFF_BYTES = 4096
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+
 
 class Gmail(Context, mail.MailClient):
     """Gmail API client for email operations.
@@ -35,11 +44,27 @@ class Gmail(Context, mail.MailClient):
         """
         q = kw.get('q') or kw.get('query')
         if not q:
-            kw = {'q': ' '.join([f'{k}:{v}' for k, v in list(kw.items())])}
+            kw = {'q': ' '.join(f'{k}:{v}' for k, v in kw.items())}
         elif 'query' in kw:
             kw = {'q': q}
         return kw
 
+    def _execute_messages(self, requests: dict[str, Any]) -> dict[str, Any]:
+        """Execute per-message requests in batches of up to GMAIL_BATCH_LIMIT.
+
+        Sub-requests that fail inside a batch (typically rate limited) are
+        retried individually with backoff. Returns a mapping of message ID to
+        the response, or to the HttpError raised for that message.
+        """
+        results = self._execute_batch(requests.items(), limit=GMAIL_BATCH_LIMIT)
+        for msgid, result in results.items():
+            if isinstance(result, errors.HttpError):
+                try:
+                    results[msgid] = requests[msgid].execute(num_retries=3)
+                except errors.HttpError as exc:
+                    results[msgid] = exc
+        return results
+
     def get_profile(self) -> dict[str, Any]:
         """Get Gmail profile information.
         """
@@ -48,112 +73,211 @@ class Gmail(Context, mail.MailClient):
     def list_emails(self, **kw: Any) -> dict[str, Any]:
         """Get email search result container, but don't pull actual emails.
         """
+        return self._list_emails(None, **kw)
+
+    def _list_emails(self, http: Any, **kw: Any) -> dict[str, Any]:
+        """List one page of matching messages, on http when given.
+        """
         token = kw.pop('token', None) or kw.pop('pageToken', None)
         kw = self._build_kw(**kw)
         if token:
             kw['pageToken'] = token
         logger.info(f"Searching Gmail API for {self.account} {kw['q']}")
-        res = self.cx.users().messages().list(userId=self.account, **kw).execute(num_retries=3)
+        res = self.cx.users().messages().list(userId=self.account, **kw).execute(
+            http=http, num_retries=3)
         logger.info(f"Total matched emails estimate: {res['resultSizeEstimate']}")
         return res
 
-    def get_emails(self, **kw: Any) -> Generator[email.message.Message, None, None]:
-        """Generate emails matching search criteria.
+    def _message_pages(self, **kw: Any) -> Generator[list[dict[str, Any]], None, None]:
+        """Generate each page of message rows matching search criteria.
+
+        The next page is listed on a background thread while the caller
+        processes the current one.
         """
         kw = self._build_kw(**kw)
+
+        def _list_ahead(token: str) -> dict[str, Any]:
+            return self._list_emails(self._thread_http(), token=token, **kw)
+
         res = self.list_emails(**kw)
-        while messages := res.get('messages'):
+        ahead = None
+        try:
+            while messages := res.get('messages'):
+                token = res.get('nextPageToken')
+                if not token:
+                    yield messages
+                    break
+                ahead = _prefetch_pool().submit(_list_ahead, token)
+                yield messages
+                res = ahead.result()
+                ahead = None
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+    def get_email_ids(self, **kw: Any) -> Generator[str, None, None]:
+        """Generate IDs of emails matching search criteria without fetching them.
+        """
+        for messages in self._message_pages(**kw):
             for row in messages:
-                try:
-                    param = {'userId': self.account, 'id': row['id'], 'format': 'raw'}
-                    data = self.cx.users().messages().get(**param).execute(num_retries=3)
-                except errors.HttpError as exc:
-                    logger.error(f"API error fetching message {row['id']}: {exc}")
+                yield row['id']
+
+    def get_emails(self, format: str = 'raw', headers: list[str] | None = None,
+                   **kw: Any) -> Generator[email.message.Message, None, None]:
+        """Generate emails matching search criteria.
+
+        Each page of results is fetched with batched requests. With
+        format='metadata' only the named headers (default From, Subject and
+        Date) are transferred and the messages have no body.
+        """
+        if format not in {'raw', 'metadata'}:
+            raise ValueError(f'Unsupported format {format}')
+        param: dict[str, Any] = {'userId': self.account, 'format': format}
+        if format == 'metadata':
+            param['metadataHeaders'] = headers or METADATA_HEADERS
+        api = self.cx.users().messages()
+        verbose = logger.isEnabledFor(logging.INFO)
+        for messages in self._message_pages(**kw):
+            results = self._execute_messages({
+                row['id']: api.get(id=row['id'], **param) for row in messages})
+            for row in messages:
+                data = results[row['id']]
+                if isinstance(data, errors.HttpError):
+                    logger.error(f"API error fetching message {row['id']}: {data}")
                     continue
-                logger.info(data['snippet'].encode('ascii', errors='ignore').decode(errors='ignore'))
-                raw = base64.urlsafe_b64decode(data['raw'].encode('ascii'))
-                message = email.message_from_bytes(raw)
-                logger.info(f"Returning email [{message['From']}]: {message['Subject']}")
+                if verbose:
+                    logger.info(data['snippet'].encode('ascii', 'ignore').decode('ascii'))
+                if format == 'raw':
+                    message = email.message_from_bytes(base64.urlsafe_b64decode(data['raw']))
+                else:
+                    message = email.message.Message()
+                    for header in data['payload'].get('headers', []):
+                        message[header['name']] = header['value']
+                if verbose:
+                    logger.info(f"Returning email [{message['From']}]: {message['Subject']}")
                 yield message
-            token = res.get('nextPageToken')
-            if not token:
-                break
-            kw.update({'token': token})
-            res = self.list_emails(**kw)
         logger.info('No more emails - exiting')
 
+    @cached_property
+    def _label_ids(self) -> dict[str, str]:
+        """Map label names to IDs, listed once per instance.
+        """
+        res = self.cx.users().labels().list(userId=self.account).execute(num_retries=3)
+        return {label['name']: label['id'] for label in res.get('labels', [])}
+
     def mark_as(self, label: str, add: bool = False, **kw: Any) -> None:
         """Mark emails matching the search criteria with a Gmail label.
-        """
-        kw = self._build_kw(**kw)
-        res = self.list_emails(**kw)
 
+        label may be a label name or ID; names are resolved against the
+        account's labels, listed once per instance. Each page of results is
+        modified with a single batchModify request.
+        """
         label_key = 'addLabelIds' if add else 'removeLabelIds'
         action = 'added' if add else 'removed'
+        label_id = self._label_ids.get(label, label)
+        api = self.cx.users().messages()
 
-        while messages := res.get('messages'):
-            for row in messages:
-                try:
-                    param = {'userId': self.account, 'id': row['id'], 'body': {label_key: [label]}}
-                    self.cx.users().messages().modify(**param).execute(num_retries=3)
-                    logger.info(f"{action.capitalize()} {label} label for message {row['id']}")
-                except errors.HttpError as exc:
-                    logger.error(f"Failed to modify {label} label for message {row['id']}: {exc}")
-                    continue
-            token = res.get('nextPageToken')
-            if not token:
-                break
-            kw.update({'token': token})
-            res = self.list_emails(**kw)
+        for messages in self._message_pages(**kw):
+            ids = [row['id'] for row in messages]
+            try:
+                api.batchModify(userId=self.account,
+                                body={'ids': ids, label_key: [label_id]}).execute(num_retries=3)
+            except errors.HttpError as err:
+                logger.error(f'Failed to modify {label} label for {len(ids)} messages: {err}')
+                continue
+            logger.info(f'{action.capitalize()} {label} label for {len(ids)} messages')
         logger.info(f'Finished marking emails: {action} {label} label')
 
     def send_mail(self, recipients: str | list[str], subject: str, body: str,
                   sender: str | None = None, attachments: list[str] | None = None) -> dict[str, Any]:
         """Send email via Gmail API (blocking, not asynchronous).
         """
+        sender = self._sender(sender)
+        if not isinstance(recipients, tuple | list):
+            recipients = [recipients]
+        parts = self._attachment_parts(attachments or [])
+        return self._send(','.join(recipients), subject, body, sender, parts)
+
+    def send_bulk(self, recipients: list[str], subject: str, body: str,
+                  sender: str | None = None, attachments: list[str] | None = None) -> list[dict[str, Any]]:
+        """Send a separate copy of the same email to each recipient.
+
+        Attachments are read and encoded once and shared by every message.
+        """
+        sender = self._sender(sender)
+        parts = self._attachment_parts(attachments or [])
+        return [self._send(to, subject, body, sender, parts) for to in recipients]
+
+    def _sender(self, sender: str | None) -> str:
+        """Return sender, falling back to the mail_from setting.
+        """
         if sender is None:
-            settings = get_settings()
-            sender = settings.get('mail_from')
+            sender = get_settings().get('mail_from')
             if sender is None:
                 raise ValueError('sender required when not configured')
+        return sender
 
-        if not isinstance(recipients, tuple | list):
-            recipients = [recipients]
-        to = ','.join(recipients)
+    def _attachment_parts(self, attachments: list[str]) -> list[MIMEBase]:
+        """Read each attachment once and build its encoded MIME part.
+        """
+        parts = []
+        for file in attachments:
+            with Path(file).open('rb') as fp:
+                head = fp.read(SNIFF_BYTES)
+                data = head + fp.read()
+            kind = filetype.guess(head)
+            content_type = kind.mime if kind else 'application/octet-stream'
+            main_type, sub_type = content_type.split('/', 1)
+            if main_type == 'text':
+                part = MIMEText(data, _subtype=sub_type)
+            elif main_type == 'image':
+                part = MIMEImage(data, _subtype=sub_type)
+            elif main_type == 'audio':
+                part = MIMEAudio(data, _subtype=sub_type)
+            else:
+                part = MIMEBase(main_type, sub_type)
+                part.set_payload(data)
+                encoders.encode_base64(part)
+            filename = Path(file).name
+            part.add_header('Content-Disposition', 'attachment', filename=filename)
+            parts.append(part)
+        return parts
 
-        if attachments is None:
-            attachments = []
+    def _send(self, to: str, subject: str, body: str, sender: str,
+              parts: list[MIMEBase]) -> dict[str, Any]:
+        """Assemble a message around prebuilt attachment parts and send it.
 
-        if not attachments:
+        Messages of at least the resumable_threshold setting (5 MiB by
+        default) are sent as a resumable message/rfc822 media upload rather
+        than base64 encoded into the request body.
+        """
+        if not parts:
             msg = MIMEText(body)
         else:
             msg = MIMEMultipart()
             msg.attach(MIMEText(body))
-            for file in attachments:
-                kind = filetype.guess(file)
-                content_type = kind.mime or 'application/octet-stream'
-                main_type, sub_type = content_type.split('/', 1)
-                with Path(file).open('rb') as fp:
-                    if main_type == 'text':
-                        part = MIMEText(fp.read(), _subtype=sub_type)
-                    elif main_type == 'image':
-                        part = MIMEImage(fp.read(), _subtype=sub_type)
-                    elif main_type == 'audio':
-                        part = MIMEAudio(fp.read(), _subtype=sub_type)
-                    else:
-                        part = MIMEBase(main_type, sub_type)
-                        part.set_payload(fp.read())
-                filename = Path(file).name
-                part.add_header('Content-Disposition', 'attachment', filename=filename)
+            for part in parts:
                 msg.attach(part)
 
         msg['to'] = to
         msg['from'] = sender
         msg['subject'] = subject
 
+        raw = msg.as_bytes()
+        settings = get_settings()
+        api = self.cx.users().messages()
         try:
-            body_dict = {'raw': base64.urlsafe_b64encode(msg.as_bytes()).decode()}
-            res = self.cx.users().messages().send(userId=self.account, body=body_dict).execute(num_retries=3)
+            if len(raw) < settings.get('resumable_threshold', RESUMABLE_THRESHOLD):
+                body_dict = {'raw': base64.urlsafe_b64encode(raw).decode()}
+                res = api.send(userId=self.account, body=body_dict).execute(num_retries=3)
+            else:
+                chunksize = settings.get('upload_chunksize') or DEFAULT_CHUNK_SIZE
+                media = MediaIoBaseUpload(io.BytesIO(raw), mimetype='message/rfc822',
+                                          chunksize=chunksize, resumable=True)
+                request = api.send(userId=self.account, body={}, media_body=media)
+                res = None
+                while res is None:
+                    _, res = request.next_chunk(num_retries=3)
             logger.info(f"Message Id: {res['id']}")
             return res
         except errors.HttpError as err:
@@ -3,6 +3,7 @@
 import logging
 import os
 import re
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -11,74 +12,45 @@ from goog.base import get_settings
 from goog.drive import Drive
 from google.oauth2 import service_account
 from googleapiclient.errors import HttpError
+from gspread.utils import DateTimeOption, ValueRenderOption
 
 from libb import copydoc, rand_retry
 
 logger = logging.getLogger(__name__)
 
 
+_RE_COMMA = re.compile(r'^([0-9\.\-\,]+)$')
+_RE_PAREN = re.compile(r'^(?:\()([0-9\.\,]+)(?:\))$')
+_RE_PCT = re.compile(r'^([0-9\.-]+)(?:%)$')
+_RE_FLOAT = re.compile(r'\A[-0-9]+\.[0-9]+\Z')
+_RE_INT = re.compile(r'\A[-0-9]+\Z')
+_NUMERIC_START = frozenset('0123456789.-,(')
+
+
 def _fmt(x: Any) -> int | float | str | None:
     """Format values from Google Sheets (handles commas, parentheses, percentages).
     """
-
-    def strip_comma(x):
-        if x is None:
-            return
-        y = re.match(r'^([0-9\.\-\,]+)$', x)
-        if y:
-            return x.replace(',', '')
-        return x
-
-    def strip_paren(x):
-        if x is None:
-            return
-        y = re.match(r'^(?:\()([0-9\.\,]+)(?:\))$', x)
-        if y:
-            return '-' + (y.group(1))
-        return x
-
-    def strip_empty(x):
-        if x is None or x in {'', '-'}:
-            return
-        return x
-
-    def strip_pct(x):
-        if x is None:
-            return
-        y = re.match(r'^([0-9\.-]+)(?:%)$', x)
-        if y:
-            return y.group(1)
+    if x is None:
+        return
+    x = str(x).strip()
+    if x in {'', '-'}:
+        return
+    if x[0] not in _NUMERIC_START:
         return x
-
-    def guess_type(s):
-        if re.match(r'\A[-0-9]+\.[0-9]+\Z', s):
-            return float
-        if re.match(r'\A[-0-9]+\Z', s):
-            return int
-        return str
-
-    def pre(x):
-        if x is None:
-            return
-        return str(x).strip()
-
-    def chain(x):
-        return strip_comma(strip_paren(strip_pct(strip_empty(x))))
-
-    def post(x):
-        if x is None:
-            return
-        try:
-            typ = guess_type(x)
-            if typ == float:
-                return float(x)
-            if typ == int:
-                return int(x)
-            return x
-        except ValueError:
-            return x
-
-    return post(chain(pre(x)))
+    if y := _RE_PCT.match(x):
+        x = y.group(1)
+    if y := _RE_PAREN.match(x):
+        x = '-' + y.group(1)
+    if _RE_COMMA.match(x):
+        x = x.replace(',', '')
+    try:
+        if _RE_FLOAT.match(x):
+            return float(x)
+        if _RE_INT.match(x):
+            return int(x)
+    except ValueError:
+        pass
+    return x
 
 
 class Sheets:
@@ -105,9 +77,17 @@ class Sheets:
         creds = creds.with_subject(account)
         auth = gspread.utils.convert_credentials(creds)
         self._gx = gspread.Client(auth)
-        self._dx = dx or Drive(account=account, key=key, scopes=scopes)
+        self._drive_args = {'account': account, 'key': key, 'scopes': scopes}
+        if dx is not None:
+            self._dx = dx
         self._idcache: dict[str, str] = {}
 
+    @cached_property
+    def _dx(self) -> Drive:
+        """Build the Drive client on first use unless one was passed in.
+        """
+        return Drive(**self._drive_args)
+
     def id(self, filepath: str) -> str:
         """Get file ID from filepath (cached).
         """
@@ -170,11 +150,31 @@ class Sheets:
     def del_spreadsheet(self, filepath: str) -> None:
         fileid = self.id(filepath)
         self._gx.del_spreadsheet(fileid)
+        self._idcache.pop(filepath, None)
+        self._dx._forget_file(filepath)
 
     @copydoc(gspread.Client.remove_permission)
     def remove_permission(self, filepath: str, email_address: str) -> Any:
+        fileid = self.id(filepath)
         permission_id = self._get_permission_id(filepath, email_address)
-        return self._gx.remove_permission(self.id(filepath), permission_id)
+        return self._gx.remove_permission(fileid, permission_id)
+
+    def remove_permissions(self, filepath: str, emails: list[str]) -> dict[str, Any]:
+        """Remove several users' permissions with one listing and batched deletes.
+
+        Returns a mapping of email to the delete response, or to the HttpError
+        raised for it. Emails without a permission on the file are skipped.
+        """
+        fileid = self.id(filepath)
+        wanted = set(emails)
+        found = {p['emailAddress']: p['id'] for p in self.list_permissions(filepath)
+                 if p.get('emailAddress') in wanted}
+        for email in wanted - found.keys():
+            logger.warning(f'No permission for {email} on {filepath}')
+        resource = self._dx.cx.permissions()
+        return self._dx._execute_batch(
+            (email, resource.delete(fileId=fileid, permissionId=pid, supportsAllDrives=True))
+            for email, pid in found.items())
 
     @copydoc(gspread.Client.list_permissions)
     def list_permissions(self, filepath: str) -> list[dict[str, Any]]:
@@ -182,8 +182,15 @@ class Sheets:
         return self._gx.list_permissions(fileid)
 
     def get_iterdict(self, filepath: str, header: int = 1, skip: int | None = None,
-                     sheetname: str | None = None) -> list[dict[str, Any]]:
+                     sheetname: str | None = None,
+                     unformatted: bool = False) -> list[dict[str, Any]]:
         """Get data from Google Sheet as list of dictionaries.
+
+        The header and data ranges are read in one batch request, and only
+        cells under a non-empty header are formatted. With unformatted, the
+        API returns numbers and booleans already typed (percentages as
+        fractions, dates still as formatted strings) and only text cells go
+        through _fmt.
         """
         assert header >= 1, 'Must include header row'
         skip = skip or header + 1
@@ -199,14 +206,18 @@ class Sheets:
                 return []
 
         sheet = sheets[0]
-        cols = [_.strip() for _ in sheet.get(f'A{header}:ZZ{header}')[0]]
-        data = sheet.get(f'A{skip}:ZZ{sheet.row_count}')
+        render = {}
+        if unformatted:
+            render = {'value_render_option': ValueRenderOption.unformatted,
+                      'date_time_render_option': DateTimeOption.formatted_string}
+        head, data = sheet.batch_get([f'A{header}:ZZ{header}',
+                                      f'A{skip}:ZZ{sheet.row_count}'], **render)
+        cols = [(i, str(_).strip()) for i, _ in enumerate(head[0]) if str(_).strip()]
 
         idict = []
         for d in data:
-            clean = [_fmt(_) for _ in d]
-            row = dict(zip(cols, clean))
-            row = {k: v for k, v in row.items() if k}
+            row = {k: _fmt(d[i]) if isinstance(d[i], str) else d[i]
+                   for i, k in cols if i < len(d)}
             idict.append(row)
 
         logger.debug(f'Extracted {len(idict)} rows from {title}:{sheet.title}')
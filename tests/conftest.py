@@ -3,12 +3,12 @@
 import os
 from unittest.mock import MagicMock, patch
 
-import cachu
 import pytest
-from goog.base import Context
+from goog.base import Context, _use_cache_dir
 from goog.calendar import Calendar
 from goog.drive import Drive
 from goog.gmail import Gmail
+from googleapiclient.errors import HttpError
 
 
 def pytest_configure(config):
@@ -32,6 +32,43 @@ def mock_cx():
     return MagicMock()
 
 
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that runs each sub-request inline.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.requests = []
+        self.executed = False
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        self.executed = True
+        for request_id, request in self.requests:
+            try:
+                response, exc = request.execute(), None
+            except HttpError as err:
+                response, exc = None, err
+            self.callback(request_id, response, exc)
+
+
+@pytest.fixture
+def fake_batches(mock_cx):
+    """Route new_batch_http_request() to FakeBatch, returning created batches.
+    """
+    batches = []
+
+    def _new_batch(callback=None):
+        batch = FakeBatch(callback)
+        batches.append(batch)
+        return batch
+
+    mock_cx.new_batch_http_request.side_effect = _new_batch
+    return batches
+
+
 @pytest.fixture
 def clean_settings():
     """Save and restore goog.base._settings.
@@ -44,8 +81,15 @@ def clean_settings():
     goog.base._settings.update(original)
 
 
+@pytest.fixture(scope='session')
+def cache_dir(tmp_path_factory):
+    """Session directory for goog's file-backed id caches.
+    """
+    return str(tmp_path_factory.mktemp('cache'))
+
+
 @pytest.fixture
-def mock_drive(mock_cx):
+def mock_drive(mock_cx, cache_dir):
     """Drive instance with patched auth, using mock service object.
     """
     with patch.object(Context, '__init__', lambda self, **kw: None):
@@ -55,7 +99,8 @@ def mock_drive(mock_cx):
         d.account = 'test@example.com'
         d._rootid = {'TestDrive': 'root123', 'Other': 'root456'}
         d._tmpdir = '/tmp/test'
-        cachu.configure(backend_default='memory')
+        d._chainless_roots = set()
+        _use_cache_dir(cache_dir)
         d.clear_cache()
         yield d
         d.clear_cache()
@@ -108,3 +108,16 @@ def http_error_from_fixture(name: str, status: int = 403) -> HttpError:
     resp.reason = 'Forbidden'
     content = (FIXTURES_DIR / f'{name}.json').read_bytes()
     return HttpError(resp, content)
+
+
+def media_response(content: bytes, status: int = 200) -> MagicMock:
+    """Build a streamed requests response for a files().get_media() download.
+    """
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    resp.status_code = status
+    resp.content = content
+    resp.headers = {'content-length': str(len(content))}
+    resp.iter_content.side_effect = lambda chunk_size: (
+        content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    return resp
@@ -1,7 +1,9 @@
 """Tests for Context auth construction and rate-limit utilities.
 """
+import threading
 from unittest.mock import MagicMock, patch
 
+import cachu
 import goog.base
 import pytest
 from goog.base import Context, is_rate_limit
@@ -12,6 +14,9 @@ from tests.fixtures.drive_responses import http_error_from_fixture
 def _auto_clean(clean_settings):
     """Auto-apply clean_settings to all tests in this module.
     """
+    Context.clear_service_cache()
+    yield
+    Context.clear_service_cache()
 
 
 def test_missing_app_raises():
@@ -39,14 +44,36 @@ def test_missing_account_uses_configured():
             'version': 'v3',
         },
     }
-    with patch('goog.base.service_account.Credentials.from_service_account_file') as mock_creds, \
-    patch('goog.base.discovery.build') as mock_build:
+    with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+    patch('googleapiclient.discovery.build_from_document') as mock_build:
         mock_creds.return_value = MagicMock()
         mock_build.return_value = MagicMock()
         ctx = Context(app='drive')
     assert ctx.account == 'configured@example.com'
 
 
+def test_configure_cache_dir_used_by_drive(tmp_path):
+    """Verify a Drive built after configure(cache_dir=) writes its id cache there.
+    """
+    from goog.drive import Drive
+    registry = cachu.config._registry
+    saved = dict(registry._configs)
+    cache_dir = tmp_path / 'ids'
+    try:
+        goog.base.configure(cache_dir=str(cache_dir))
+        with patch.object(Context, '__init__', lambda self, **kw: None):
+            drive = Drive()
+        cachu.clear_backends('goog')
+        cachu.cache_set(drive._resolve_segment, 'seg_id', parent_id='p1', segment='s1')
+        assert any(cache_dir.iterdir())
+        assert cachu.cache_get(drive._resolve_segment, None,
+                               parent_id='p1', segment='s1') == 'seg_id'
+    finally:
+        cachu.clear_backends('goog')
+        registry._configs.clear()
+        registry._configs.update(saved)
+
+
 def test_unknown_app_no_key_raises():
     """Verify unknown app without explicit key raises.
     """
@@ -59,8 +86,8 @@ def test_explicit_credentials_bypass_config():
     """Verify explicit key/scopes/version bypass app_configs.
     """
     goog.base._settings['account'] = 'test@example.com'
-    with patch('goog.base.service_account.Credentials.from_service_account_file') as mock_creds, \
-    patch('goog.base.discovery.build') as mock_build:
+    with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+    patch('googleapiclient.discovery.build_from_document') as mock_build:
         mock_creds.return_value = MagicMock()
         mock_build.return_value = MagicMock()
         ctx = Context(app='drive', key='/my/key.json',
@@ -69,6 +96,175 @@ def test_explicit_credentials_bypass_config():
     mock_creds.assert_called_once_with('/my/key.json')
 
 
+class TestServiceCache:
+    """Tests for per-(app, version, account, key) service reuse.
+    """
+
+    def test_same_config_reuses_service(self):
+        """Verify a second Context with identical config skips discovery.
+        """
+        goog.base._settings['account'] = 'test@example.com'
+        with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+        patch('googleapiclient.discovery.build_from_document') as mock_build:
+            mock_creds.return_value = MagicMock()
+            mock_build.return_value = MagicMock()
+            ctx1 = Context(app='drive', key='/my/key.json',
+                           scopes=['https://scope'], version='v3')
+            ctx2 = Context(app='drive', key='/my/key.json',
+                           scopes=['https://scope'], version='v3')
+        assert ctx1.cx is ctx2.cx
+        mock_build.assert_called_once()
+        mock_creds.assert_called_once()
+
+    def test_different_account_builds_new_service(self):
+        """Verify services are not shared across delegated accounts.
+        """
+        with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+        patch('googleapiclient.discovery.build_from_document') as mock_build:
+            mock_creds.return_value = MagicMock()
+            mock_build.side_effect = [MagicMock(), MagicMock()]
+            ctx1 = Context(app='drive', account='a@example.com', key='/my/key.json',
+                           scopes=['https://scope'], version='v3')
+            ctx2 = Context(app='drive', account='b@example.com', key='/my/key.json',
+                           scopes=['https://scope'], version='v3')
+        assert ctx1.cx is not ctx2.cx
+        assert mock_build.call_count == 2
+
+    def test_services_share_pooled_http(self):
+        """Verify services built on one thread reuse that thread's Http.
+        """
+        with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+        patch('googleapiclient.discovery.build_from_document') as mock_build:
+            mock_creds.return_value = MagicMock()
+            mock_build.side_effect = [MagicMock(), MagicMock()]
+            Context(app='drive', account='a@example.com', key='/my/key.json',
+                    scopes=['https://scope'], version='v3')
+            Context(app='gmail', account='a@example.com', key='/my/key.json',
+                    scopes=['https://scope'], version='v1')
+        http1 = mock_build.call_args_list[0].kwargs['http']
+        http2 = mock_build.call_args_list[1].kwargs['http']
+        assert http1 is not http2
+        assert http1.http is http2.http is goog.base._pooled_http()
+
+    def test_pooled_http_is_per_thread(self):
+        """Verify each thread gets its own underlying Http.
+        """
+        other = []
+        worker = threading.Thread(target=lambda: other.append(goog.base._pooled_http()))
+        worker.start()
+        worker.join()
+        assert other[0] is not goog.base._pooled_http()
+
+    def test_other_thread_builds_new_service(self):
+        """Verify a Context created on another thread gets its own service.
+        """
+        with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+        patch('googleapiclient.discovery.build_from_document') as mock_build:
+            mock_creds.return_value = MagicMock()
+            mock_build.side_effect = [MagicMock(), MagicMock()]
+            ctx1 = Context(app='drive', account='a@example.com', key='/my/key.json',
+                           scopes=['https://scope'], version='v3')
+            other = []
+            worker = threading.Thread(target=lambda: other.append(
+                Context(app='drive', account='a@example.com', key='/my/key.json',
+                        scopes=['https://scope'], version='v3')))
+            worker.start()
+            worker.join()
+        assert ctx1.cx is not other[0].cx
+        assert mock_build.call_count == 2
+
+    def test_clear_service_cache_forces_rebuild(self):
+        """Verify clear_service_cache drops cached services.
+        """
+        with patch('google.oauth2.service_account.Credentials.from_service_account_file') as mock_creds, \
+        patch('googleapiclient.discovery.build_from_document') as mock_build:
+            mock_creds.return_value = MagicMock()
+            mock_build.return_value = MagicMock()
+            Context(app='drive', account='a@example.com', key='/my/key.json',
+                    scopes=['https://scope'], version='v3')
+            Context.clear_service_cache()
+            Context(app='drive', account='a@example.com', key='/my/key.json',
+                    scopes=['https://scope'], version='v3')
+        assert mock_build.call_count == 2
+
+
+class TestDiscoveryDocument:
+    """Tests for the per-process discovery document cache.
+    """
+
+    def test_document_parsed_once(self):
+        """Verify the bundled document is loaded once per (app, version).
+        """
+        with patch('goog.base.discovery_cache.get_static_doc',
+                   return_value='{"name": "drive"}') as mock_doc:
+            d1 = goog.base._discovery_document('drive', 'v3')
+            d2 = goog.base._discovery_document('drive', 'v3')
+        assert d1 is d2
+        mock_doc.assert_called_once_with('drive', 'v3')
+
+    def test_unknown_version_raises(self):
+        """Verify a missing bundled document raises UnknownApiNameOrVersion.
+        """
+        from googleapiclient.errors import UnknownApiNameOrVersion
+        with pytest.raises(UnknownApiNameOrVersion):
+            goog.base._discovery_document('drive', 'v999')
+
+
+class TestExecuteBatch:
+    """Tests for Context._execute_batch() retries.
+    """
+
+    def _context(self, outcomes):
+        """Context whose batches raise each outcome in turn, then answer every request.
+        """
+        ctx = Context.__new__(Context)
+        ctx.cx = MagicMock()
+        outcomes = list(outcomes)
+
+        def _new_batch(callback=None):
+            batch = MagicMock()
+            added = []
+            batch.add.side_effect = lambda request, request_id=None: added.append(request_id)
+
+            def _execute():
+                if outcomes:
+                    raise outcomes.pop(0)
+                for request_id in added:
+                    callback(request_id, {'id': request_id}, None)
+
+            batch.execute.side_effect = _execute
+            return batch
+
+        ctx.cx.new_batch_http_request.side_effect = _new_batch
+        return ctx
+
+    def test_transient_batch_failure_retried(self):
+        """Verify a 5xx or dropped connection on the batch POST is retried.
+        """
+        from googleapiclient.errors import HttpError
+        ctx = self._context([HttpError(MagicMock(status=503), b''), ConnectionResetError()])
+        with patch('goog.base.time.sleep') as sleep:
+            results = ctx._execute_batch([('a', MagicMock()), ('b', MagicMock())])
+        assert results == {'a': {'id': 'a'}, 'b': {'id': 'b'}}
+        assert sleep.call_count == 2
+
+    def test_client_error_not_retried(self):
+        """Verify a 4xx batch failure is raised without retrying.
+        """
+        from googleapiclient.errors import HttpError
+        ctx = self._context([HttpError(MagicMock(status=400), b'')])
+        with patch('goog.base.time.sleep') as sleep, pytest.raises(HttpError):
+            ctx._execute_batch([('a', MagicMock())])
+        sleep.assert_not_called()
+
+    def test_persistent_failure_raised(self):
+        """Verify the error is raised once the retries are used up.
+        """
+        ctx = self._context([ConnectionResetError()] * (goog.base.BATCH_RETRIES + 1))
+        with patch('goog.base.time.sleep'), pytest.raises(ConnectionResetError):
+            ctx._execute_batch([('a', MagicMock())])
+
+
 class TestIsRateLimit:
     """Tests for is_rate_limit() classifier.
     """
@@ -131,3 +327,20 @@ class TestIsRateLimit:
         exc = MagicMock()
         exc.resp = resp
         assert is_rate_limit(exc) is False
+
+
+class TestLazyImports:
+    """Tests for on-demand client imports in the goog package.
+    """
+
+    def test_client_resolves_on_access(self):
+        """Verify goog.Drive loads the class from goog.drive.
+        """
+        from goog.drive import Drive
+        assert goog.Drive is Drive
+
+    def test_unknown_attribute_raises(self):
+        """Verify unknown names still raise AttributeError.
+        """
+        with pytest.raises(AttributeError):
+            goog.Nope
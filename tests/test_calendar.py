@@ -1,5 +1,6 @@
 """Mock integration tests for Calendar module.
 """
+from tests.fixtures.drive_responses import http_error_from_fixture
 
 
 class TestListCalendar:
@@ -76,3 +77,46 @@ class TestInsertEvents:
         result = calendar.insert_events(calendarId='primary', body=body)
         assert result == expected
         events_api.insert.assert_called_once_with(calendarId='primary', body=body)
+
+
+class TestDeleteEventsMany:
+    """Tests for delete_events_many() batching.
+    """
+
+    def test_batches_by_limit(self, calendar, mock_cx, fake_batches):
+        """Verify events are split into batches of at most 100.
+        """
+        events_api = mock_cx.events.return_value
+        events_api.delete.return_value.execute.return_value = ''
+        ids = [f'evt{i}' for i in range(150)]
+        results = calendar.delete_events_many('primary', ids)
+        assert [len(b.requests) for b in fake_batches] == [100, 50]
+        assert all(b.executed for b in fake_batches)
+        assert set(results) == set(ids)
+        events_api.delete.assert_any_call(calendarId='primary', eventId='evt0')
+
+    def test_collects_errors(self, calendar, mock_cx, fake_batches):
+        """Verify a failed sub-request is reported, not raised.
+        """
+        events_api = mock_cx.events.return_value
+        exc = http_error_from_fixture('files_update_rate_limit_exceeded', 403)
+        events_api.delete.return_value.execute.side_effect = ['', exc]
+        results = calendar.delete_events_many('primary', ['evt1', 'evt2'])
+        assert results['evt1'] == ''
+        assert results['evt2'] is exc
+
+
+class TestInsertEventsMany:
+    """Tests for insert_events_many() batching.
+    """
+
+    def test_returns_responses_in_order(self, calendar, mock_cx, fake_batches):
+        """Verify responses line up with the input bodies.
+        """
+        events_api = mock_cx.events.return_value
+        events_api.insert.return_value.execute.side_effect = [
+            {'id': 'new1'}, {'id': 'new2'}]
+        bodies = [{'summary': 'A'}, {'summary': 'B'}]
+        results = calendar.insert_events_many('primary', bodies)
+        assert results == [{'id': 'new1'}, {'id': 'new2'}]
+        assert len(fake_batches) == 1
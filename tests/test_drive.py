@@ -4,9 +4,14 @@ Tests path normalization, splitting, path resolution, walk, exists, write,
 delete, move, copy, search, export, and cache behavior by mocking self.cx
 (Discovery API service).
 """
+import io
 import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
+import goog
 import pytest
 from goog.base import RateLimitError, clean_filename
 from goog.drive import CHANGES_FIELDS, FOLDER_MIME
@@ -15,7 +20,7 @@ from tests.fixtures.drive_responses import change_entry, changes_list_response
 from tests.fixtures.drive_responses import file_entry, files_get_response
 from tests.fixtures.drive_responses import files_list_response, folder_entry
 from tests.fixtures.drive_responses import http_error_from_fixture
-from tests.fixtures.drive_responses import load_fixture
+from tests.fixtures.drive_responses import load_fixture, media_response
 
 
 def _setup_folder_resolution(mock_cx, segments: list[tuple[str, str]]) -> None:
@@ -82,6 +87,67 @@ class TestSplitPath:
         """
         assert mock_drive._split_path(path) == expected
 
+    def test_split_path_returns_fresh_list(self, mock_drive):
+        """Verify cached splitting does not leak mutations between calls.
+        """
+        parts = mock_drive._split_path('/TestDrive/sub')
+        parts.append('mutated')
+        assert mock_drive._split_path('/TestDrive/sub') == ['TestDrive', 'sub']
+
+
+class TestIterList:
+    """Tests for Drive._iter_list() pagination.
+    """
+
+    def test_iter_list_follows_page_tokens(self, mock_drive, mock_cx):
+        """Verify every page is fetched with the default page size.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([file_entry('a', 'id_a')], next_page_token='tok2'),
+            files_list_response([file_entry('b', 'id_b')]),
+            ]
+        ids = [f['id'] for f in mock_drive._iter_list(q='x', fields='files(id)')]
+        assert ids == ['id_a', 'id_b']
+        calls = files.list.call_args_list
+        assert [c.kwargs['pageToken'] for c in calls] == [None, 'tok2']
+        assert all(c.kwargs['pageSize'] == 1000 for c in calls)
+        assert calls[0].kwargs['supportsAllDrives'] is True
+
+    def test_prefetch_reuses_long_lived_threads(self, mock_drive, mock_cx):
+        """Verify prefetched pages run on the shared pool, not a pool per listing.
+        """
+        files = mock_cx.files.return_value
+        page1 = files_list_response([file_entry('a', 'id_a')], next_page_token='tok2')
+        page2 = files_list_response([file_entry('b', 'id_b')])
+        files.list.return_value.execute.side_effect = [page1, page2, page1, page2]
+        threads = []
+
+        def _record():
+            threads.append(threading.current_thread())
+            return MagicMock()
+
+        with patch.object(type(mock_drive), '_thread_http', side_effect=_record), \
+             patch('goog.drive.ThreadPoolExecutor') as new_pool:
+            for _ in range(2):
+                pages = list(mock_drive._iter_pages(prefetch=True, q='x'))
+                assert [p['files'][0]['id'] for p in pages] == ['id_a', 'id_b']
+        new_pool.assert_not_called()
+        assert all(t.name.startswith('goog-prefetch') for t in threads)
+        assert goog.base._prefetch_pool() is goog.base._prefetch_pool()
+
+    def test_iter_list_first_match_stops_early(self, mock_drive, mock_cx):
+        """Verify taking the first item does not fetch later pages.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([file_entry('a', 'id_a')], next_page_token='tok2'),
+            ]
+        first = next(mock_drive._iter_list(q='x', pageSize=1), None)
+        assert first['id'] == 'id_a'
+        assert files.list.call_args.kwargs['pageSize'] == 1
+        assert files.list.return_value.execute.call_count == 1
+
 
 class TestCleanFilename:
     """Tests for clean_filename().
@@ -91,9 +157,10 @@ class TestCleanFilename:
         ("it's a file", "it\\'s a file"),
         ('normal_file.txt', 'normal_file.txt'),
         ("a'b'c", "a\\'b\\'c"),
+        ('back\\slash', 'back\\\\slash'),
     ])
     def test_clean_filename(self, input_name, expected):
-        """Verify quote escaping in filenames.
+        """Verify quote and backslash escaping in filenames.
         """
         assert clean_filename(input_name) == expected
 
@@ -290,13 +357,8 @@ class TestWalk:
         Call sequence for recursive walk into /TestDrive/docs/sub:
         1. id('/TestDrive/docs') -> _resolve_fileid finds 'docs' from root
         2. walk lists folder_docs contents (top_resp)
-        3. Hits subfolder 'sub', calls id('/TestDrive/docs/sub')
-        4. _resolve_fileid -> _resolve_folderid('/TestDrive/docs/') ->
-           _resolve_segment('root123','docs')
-        5. Looks for file 'sub' in folder_docs -> empty
-        6. Falls back _resolve_folderid('/TestDrive/docs/sub/') ->
-           docs segment cached, _resolve_segment(folder_docs,'sub')
-        7. walk lists sub contents
+        3. Hits subfolder 'sub' and lists it by the id already returned
+           in top_resp, without re-resolving its path
         """
         files = mock_cx.files.return_value
         top_resp = files_list_response([
@@ -306,18 +368,110 @@ class TestWalk:
         sub_resp = files_list_response([
             file_entry('b.txt', 'id_b', 'text/plain'),
         ])
-        docs_segment = files_list_response([folder_entry('docs', 'folder_docs')])
-        sub_segment = files_list_response([folder_entry('sub', 'id_sub')])
-        empty = files_list_response([])
 
         folder_resolve = files_list_response([folder_entry('docs', 'folder_docs')])
         files.list.return_value.execute.side_effect = [
-            folder_resolve, top_resp,
-            docs_segment, empty, sub_segment, sub_resp,
+            folder_resolve, top_resp, sub_resp,
         ]
         results = list(mock_drive.walk('/TestDrive/docs', recursive=True))
         assert '/TestDrive/docs/a.txt' in results
         assert '/TestDrive/docs/sub/b.txt' in results
+        sub_query = files.list.call_args_list[-1].kwargs['q']
+        assert "'id_sub' in parents" in sub_query
+
+    def test_walk_seeds_segment_cache(self, mock_drive, mock_cx):
+        """Verify subfolders seen by walk resolve later without an API call.
+        """
+        files = mock_cx.files.return_value
+        resp = files_list_response([
+            folder_entry('sub', 'id_sub'),
+        ])
+        folder_resolve = files_list_response([folder_entry('docs', 'folder_docs')])
+        files.list.return_value.execute.side_effect = [
+            folder_resolve, resp, files_list_response([])]
+        list(mock_drive.walk('/TestDrive/docs', recursive=True))
+        calls = files.list.return_value.execute.call_count
+        assert mock_drive._resolve_segment('folder_docs', 'sub') == 'id_sub'
+        assert files.list.return_value.execute.call_count == calls
+
+    def test_walk_non_recursive_excludes_folders_in_query(self, mock_drive, mock_cx):
+        """Verify a flat listing asks the API to drop folders.
+        """
+        files = mock_cx.files.return_value
+        folder_resolve = files_list_response([folder_entry('docs', 'folder_docs')])
+        files.list.return_value.execute.side_effect = [
+            folder_resolve, files_list_response([])]
+        list(mock_drive.walk('/TestDrive/docs'))
+        assert f"mimeType!='{FOLDER_MIME}'" in files.list.call_args.kwargs['q']
+        assert files.list.call_args.kwargs['fields'] == 'nextPageToken, files(id, name)'
+
+    def test_walk_name_prefix_filters_files_server_side(self, mock_drive, mock_cx):
+        """Verify name_prefix goes into the query and keeps folders recursable.
+        """
+        files = mock_cx.files.return_value
+        folder_resolve = files_list_response([folder_entry('docs', 'folder_docs')])
+        files.list.return_value.execute.side_effect = [
+            folder_resolve, files_list_response([])]
+        list(mock_drive.walk('/TestDrive/docs', recursive=True, name_prefix="O'Brien"))
+        q = files.list.call_args.kwargs['q']
+        assert f"(name contains 'O\\'Brien' or mimeType='{FOLDER_MIME}')" in q
+
+    def test_resolve_segment_escapes_quotes(self, mock_drive, mock_cx):
+        """Verify folder names with quotes are escaped in the lookup query.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        mock_drive._resolve_segment('root123', "it's")
+        assert "name='it\\'s'" in files.list.call_args.kwargs['q']
+
+    def test_walk_seeds_file_id_cache(self, mock_drive, mock_cx):
+        """Verify id() on a path yielded by walk needs no further API call.
+        """
+        files = mock_cx.files.return_value
+        resp = files_list_response([
+            file_entry('a.txt', 'id_a', 'text/plain'),
+        ])
+        folder_resolve = files_list_response([folder_entry('docs', 'folder_docs')])
+        files.list.return_value.execute.side_effect = [folder_resolve, resp]
+        paths = list(mock_drive.walk('/TestDrive/docs'))
+        calls = files.list.return_value.execute.call_count
+        assert mock_drive.id(paths[0]) == 'id_a'
+        assert files.list.return_value.execute.call_count == calls
+
+    def test_delete_forgets_cached_file_id(self, mock_drive, mock_cx):
+        """Verify delete drops the walk-seeded id for the removed path.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_files('/TestDrive/docs', [file_entry('a.txt', 'id_a', 'text/plain')])
+        mock_drive.delete('/TestDrive/docs/a.txt')
+        files.delete.assert_called_once_with(fileId='id_a', supportsAllDrives=True)
+        files.list.return_value.execute.return_value = files_list_response([])
+        assert mock_drive._resolve_fileid('/TestDrive/docs/a.txt') is None
+
+    def test_delete_by_folder_filename_forgets_cached_file_id(self, mock_drive, mock_cx):
+        """Verify the folder/filename form of delete also drops the cached id.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_files('/TestDrive', [file_entry('a.txt', 'id_a', 'text/plain')])
+        files.list.return_value.execute.return_value = files_list_response(
+            [file_entry('a.txt', 'id_a', 'text/plain')])
+        mock_drive.delete(folder='/TestDrive', filename='a.txt')
+        files.delete.assert_called_once_with(fileId='id_a', supportsAllDrives=True)
+        files.list.return_value.execute.return_value = files_list_response([])
+        assert not mock_drive.exists('/TestDrive/a.txt')
+
+    def test_delete_folder_drops_cached_folder_paths(self, mock_drive, mock_cx):
+        """Verify deleting a cached folder stops its subpaths resolving to stale ids.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_segments('root123', [folder_entry('docs', 'folder_docs')])
+        mock_drive._cache_segments('folder_docs', [folder_entry('sub', 'folder_sub')])
+        assert mock_drive.id('/TestDrive/docs/sub/') == 'folder_sub'
+        files.list.return_value.execute.return_value = files_list_response([])
+        mock_drive.delete('/TestDrive/docs')
+        files.delete.assert_called_once_with(fileId='folder_docs', supportsAllDrives=True)
+        with pytest.raises(LookupError):
+            mock_drive.id('/TestDrive/docs/sub/')
 
     def test_walk_pagination(self, mock_drive, mock_cx):
         """Verify walk handles multi-page responses.
@@ -345,6 +499,95 @@ class TestWalk:
         results = list(mock_drive.walk('/TestDrive'))
         assert results == ['/TestDrive/readme.md']
 
+    def _route_by_parent(self, mock_cx, pages):
+        """Route files().list() by parent id so threaded calls stay deterministic.
+
+        pages maps a parent id to a list of responses returned in sequence.
+        Returns the list of request mocks created, in call order.
+        """
+        pages = {k: list(v) for k, v in pages.items()}
+        requests = []
+
+        def _list(**kw):
+            parent = kw['q'].split("'")[1]
+            request = MagicMock()
+            request.execute.return_value = pages[parent].pop(0)
+            requests.append(request)
+            return request
+        mock_cx.files.return_value.list.side_effect = _list
+        return requests
+
+    def test_walk_parallel_recursive(self, mock_drive, mock_cx):
+        """Verify max_workers > 1 walks every subfolder and page.
+        """
+        self._route_by_parent(mock_cx, {
+            'root123': [files_list_response([
+                file_entry('a.txt', 'id_a', 'text/plain'),
+                folder_entry('sub1', 'id_s1'),
+                folder_entry('sub2', 'id_s2'),
+            ])],
+            'id_s1': [
+                files_list_response([file_entry('b.txt', 'id_b', 'text/plain')],
+                                    next_page_token='tok2'),
+                files_list_response([file_entry('c.txt', 'id_c', 'text/plain')]),
+            ],
+            'id_s2': [files_list_response([
+                folder_entry('deep', 'id_deep'),
+            ])],
+            'id_deep': [files_list_response([
+                file_entry('d.txt', 'id_d', 'text/plain'),
+            ])],
+        })
+        results = list(mock_drive.walk('/TestDrive', recursive=True, max_workers=4))
+        assert sorted(results) == [
+            '/TestDrive/a.txt',
+            '/TestDrive/sub1/b.txt',
+            '/TestDrive/sub1/c.txt',
+            '/TestDrive/sub2/deep/d.txt',
+        ]
+        tokens = [c.kwargs['pageToken'] for c in mock_cx.files.return_value.list.call_args_list]
+        assert tokens.count('tok2') == 1
+
+    def test_walk_parallel_uses_thread_http(self, mock_drive, mock_cx):
+        """Verify worker listings execute on a per-thread transport.
+        """
+        requests = self._route_by_parent(mock_cx, {
+            'root123': [files_list_response([
+                file_entry('a.txt', 'id_a', 'text/plain'),
+            ])],
+        })
+        http = MagicMock()
+        with patch.object(type(mock_drive), '_thread_http', return_value=http):
+            results = list(mock_drive.walk('/TestDrive', max_workers=2))
+        assert results == ['/TestDrive/a.txt']
+        requests[0].execute.assert_called_once_with(http=http, num_retries=5)
+
+
+    def test_walk_serial_breadth_first_prefetch(self, mock_drive, mock_cx):
+        """Verify the serial walk is breadth-first and prefetches later pages.
+        """
+        requests = self._route_by_parent(mock_cx, {
+            'root123': [
+                files_list_response([
+                    folder_entry('sub', 'id_sub'),
+                    file_entry('a.txt', 'id_a', 'text/plain'),
+                ], next_page_token='tok2'),
+                files_list_response([file_entry('b.txt', 'id_b', 'text/plain')]),
+            ],
+            'id_sub': [files_list_response([
+                file_entry('c.txt', 'id_c', 'text/plain'),
+            ])],
+        })
+        http = MagicMock()
+        with patch.object(type(mock_drive), '_thread_http', return_value=http):
+            results = list(mock_drive.walk('/TestDrive', recursive=True))
+        assert results == [
+            '/TestDrive/a.txt',
+            '/TestDrive/b.txt',
+            '/TestDrive/sub/c.txt',
+        ]
+        requests[0].execute.assert_called_once_with(http=None, num_retries=5)
+        requests[1].execute.assert_called_once_with(http=http, num_retries=5)
 
 class TestWalkFlat:
     """Tests for walk(flat=True) drive-wide scan mode.
@@ -528,6 +771,41 @@ class TestDelete:
         assert call_kwargs['fileId'] == 'file_old'
 
 
+class TestDeleteMany:
+    """Tests for delete_many() batched deletes.
+    """
+
+    def test_delete_many_single_batch(self, mock_drive, mock_cx, fake_batches):
+        """Verify resolved IDs are deleted in one batch.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([file_entry('a.txt', 'file_a')]),
+            files_list_response([file_entry('b.txt', 'file_b')]),
+            ]
+        files.delete.return_value.execute.return_value = ''
+        mock_drive.delete_many(['/TestDrive/a.txt', '/TestDrive/b.txt'])
+        assert len(fake_batches) == 1
+        assert len(fake_batches[0].requests) == 2
+        deleted = {c.kwargs['fileId'] for c in files.delete.call_args_list}
+        assert deleted == {'file_a', 'file_b'}
+
+    def test_delete_many_raises_after_attempting_all(self, mock_drive, mock_cx,
+                                                     fake_batches):
+        """Verify a failed delete raises after the whole batch ran.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([file_entry('a.txt', 'file_a')]),
+            files_list_response([file_entry('b.txt', 'file_b')]),
+            ]
+        exc = http_error_from_fixture('files_update_move_folder_blocked', 403)
+        files.delete.return_value.execute.side_effect = [exc, '']
+        with pytest.raises(HttpError):
+            mock_drive.delete_many(['/TestDrive/a.txt', '/TestDrive/b.txt'])
+        assert files.delete.return_value.execute.call_count == 2
+
+
 class TestProtect:
     """Tests for _protect() overwrite guard.
     """
@@ -561,6 +839,18 @@ class TestProtect:
         call_kwargs = files.delete.call_args[1]
         assert call_kwargs['fileId'] == 'file_exists'
 
+    def test_protect_overwrite_uses_resolved_id(self, mock_drive, mock_cx):
+        """Verify overwrite deletes by the id already found, with one lookup.
+        """
+        files = mock_cx.files.return_value
+        file_resp = files_list_response([file_entry('existing.txt', 'file_exists')])
+        files.list.return_value.execute.return_value = file_resp
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            mock_drive._protect('/TestDrive/existing.txt', overwrite=True)
+        assert files.list.return_value.execute.call_count == 1
+        files.delete.assert_called_once_with(fileId='file_exists', supportsAllDrives=True)
+
 
 class TestValidateFolder:
     """Tests for _validate_folder().
@@ -1020,6 +1310,21 @@ class TestMove:
         assert call_kwargs['addParents'] == 'folder_archive'
         assert 'root123' in call_kwargs['removeParents']
 
+    def test_move_file_keeps_folder_cache(self, mock_drive, mock_cx):
+        """Verify moving a file re-keys only its own cached id.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_segments('root123', [folder_entry('archive', 'folder_archive')])
+        mock_drive._cache_files('/TestDrive', [file_entry('doc.txt', 'file_doc')])
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.get.return_value.execute.return_value = {
+            'parents': ['root123'], 'mimeType': 'text/plain'}
+        mock_drive.move('/TestDrive/doc.txt', '/TestDrive/archive')
+        assert files.update.call_args.kwargs['addParents'] == 'folder_archive'
+        assert mock_drive._resolve_segment('root123', 'archive') == 'folder_archive'
+        assert mock_drive._resolve_fileid('/TestDrive/doc.txt') is None
+        assert mock_drive.id('/TestDrive/archive/doc.txt') == 'file_doc'
+
     def test_move_folder_trailing_slash(self, mock_drive, mock_cx):
         """Verify folder move with trailing-slash path resolves and updates parents.
         """
@@ -1041,18 +1346,18 @@ class TestMove:
         assert 'root123' in call_kwargs['removeParents']
 
     def test_move_folder_no_trailing_slash(self, mock_drive, mock_cx):
-        """Verify folder move without trailing slash uses id() fallback to folder.
+        """Verify folder move without trailing slash resolves via the name query.
+
+        The name query has no mimeType filter, so it matches the folder.
         """
         files = mock_cx.files.return_value
-        empty = files_list_response([])
         src_resolve = files_list_response(
             [folder_entry('mydir', 'folder_mydir')])
         dest_resolve = files_list_response(
             [folder_entry('archive', 'folder_archive')])
         parents_resp = {'parents': ['root123']}
         update_resp = {'id': 'folder_mydir', 'parents': ['folder_archive']}
-        files.list.return_value.execute.side_effect = [
-            empty, src_resolve, dest_resolve]
+        files.list.return_value.execute.side_effect = [src_resolve, dest_resolve]
         files.get.return_value.execute.return_value = parents_resp
         files.update.return_value.execute.return_value = update_resp
         mock_drive.move('/TestDrive/mydir', '/TestDrive/archive/')
@@ -1060,6 +1365,24 @@ class TestMove:
         call_kwargs = files.update.call_args[1]
         assert call_kwargs['addParents'] == 'folder_archive'
 
+    def test_id_missing_path_single_lookup(self, mock_drive, mock_cx):
+        """Verify a missing path costs one name query, not a second folder query.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_segments('root123', [folder_entry('docs', 'folder_docs')])
+        files.list.return_value.execute.return_value = files_list_response([])
+        with pytest.raises(LookupError):
+            mock_drive.id('/TestDrive/docs/missing')
+        assert files.list.return_value.execute.call_count == 1
+
+    def test_id_cached_folder_skips_api(self, mock_drive, mock_cx):
+        """Verify a folder path without trailing slash resolves from the segment cache.
+        """
+        files = mock_cx.files.return_value
+        mock_drive._cache_segments('root123', [folder_entry('docs', 'folder_docs')])
+        assert mock_drive.id('/TestDrive/docs') == 'folder_docs'
+        files.list.assert_not_called()
+
     def test_move_not_found_raises(self, mock_drive, mock_cx):
         """Verify move raises LookupError when item not found via folder/filename.
         """
@@ -1113,24 +1436,59 @@ class TestRead:
         files.list.return_value.execute.return_value = file_resp
 
         content = b'hello world'
+        session = MagicMock()
+        session.get.return_value = media_response(content)
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            result = mock_drive.read('/TestDrive/data.bin')
 
-        def fake_download_init(fh, request):
-            fh.write(content)
-            return MagicMock(next_chunk=MagicMock(return_value=(None, True)))
+        assert result.read() == content
+        assert result.tell() == len(content)
+        assert session.get.call_args.kwargs['stream'] is True
 
-        with patch('goog.drive.MediaIoBaseDownload') as mock_dl:
-            mock_instance = MagicMock()
-            mock_instance.next_chunk.return_value = (None, True)
+    def test_read_chunksize_from_settings(self, mock_drive, mock_cx, clean_settings):
+        """Verify read falls back to the configured download_chunksize.
+        """
+        files = mock_cx.files.return_value
+        file_resp = files_list_response([file_entry('data.bin', 'file_data')])
+        files.list.return_value.execute.return_value = file_resp
+        goog.configure(download_chunksize=8 * 1024 * 1024)
 
-            def init_side_effect(fh, request):
-                fh.write(content)
-                return mock_instance
+        session = MagicMock()
+        session.get.return_value = media_response(b'data')
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            mock_drive.read('/TestDrive/data.bin')
 
-            mock_dl.side_effect = init_side_effect
-            result = mock_drive.read('/TestDrive/data.bin')
+        session.get.return_value.iter_content.assert_called_once_with(
+            chunk_size=8 * 1024 * 1024)
 
-        assert result.read() == content
-        assert result.tell() == len(content)
+    def test_read_reuses_out_buffer(self, mock_drive, mock_cx):
+        """Verify read fills and returns a caller-supplied buffer.
+        """
+        files = mock_cx.files.return_value
+        file_resp = files_list_response([file_entry('data.bin', 'file_data')])
+        files.list.return_value.execute.return_value = file_resp
+
+        buf = io.BytesIO(b'previous longer contents')
+        session = MagicMock()
+        session.get.return_value = media_response(b'new')
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            result = mock_drive.read('/TestDrive/data.bin', out=buf)
+
+        assert result is buf
+        assert result.read() == b'new'
+
+    def test_read_http_error_raises(self, mock_drive, mock_cx):
+        """Verify an error status from the media endpoint raises HttpError.
+        """
+        files = mock_cx.files.return_value
+        file_resp = files_list_response([file_entry('data.bin', 'file_data')])
+        files.list.return_value.execute.return_value = file_resp
+
+        session = MagicMock()
+        session.get.return_value = media_response(b'{}', status=404)
+        with patch.object(type(mock_drive), '_thread_session', return_value=session), \
+             pytest.raises(HttpError):
+            mock_drive.read('/TestDrive/data.bin')
 
 
 class TestDownload:
@@ -1138,20 +1496,93 @@ class TestDownload:
     """
 
     def test_download_to_directory(self, mock_drive, mock_cx, tmp_path):
-        """Verify download writes file to specified directory.
+        """Verify download streams the file into the specified directory.
         """
         files = mock_cx.files.return_value
         file_resp = files_list_response([file_entry('report.pdf', 'file_report')])
         files.list.return_value.execute.return_value = file_resp
 
-        with patch('goog.drive.MediaIoBaseDownload') as mock_dl:
-            mock_instance = MagicMock()
-            mock_instance.next_chunk.return_value = (None, True)
-            mock_dl.return_value = mock_instance
+        session = MagicMock()
+        session.get.return_value = media_response(b'%PDF-1.4')
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
             result = mock_drive.download('/TestDrive/report.pdf', directory=str(tmp_path))
 
         assert result is not None
         assert 'report.pdf' in result
+        assert (tmp_path / 'report.pdf').read_bytes() == b'%PDF-1.4'
+
+    def test_download_explicit_chunksize(self, mock_drive, mock_cx, tmp_path):
+        """Verify an explicit chunksize sets the streamed read size.
+        """
+        files = mock_cx.files.return_value
+        file_resp = files_list_response([file_entry('report.pdf', 'file_report')])
+        files.list.return_value.execute.return_value = file_resp
+
+        session = MagicMock()
+        session.get.return_value = media_response(b'abcdef')
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            mock_drive.download('/TestDrive/report.pdf', directory=str(tmp_path),
+                                chunksize=4)
+
+        session.get.return_value.iter_content.assert_called_once_with(chunk_size=4)
+        assert (tmp_path / 'report.pdf').read_bytes() == b'abcdef'
+
+    def test_download_many_fetches_each_file(self, mock_drive, mock_cx, tmp_path):
+        """Verify download_many resolves every path and streams each file.
+        """
+        mock_drive._cache_files('/TestDrive', [
+            file_entry('a.pdf', 'id_a'), file_entry('b.pdf', 'id_b')])
+        files = mock_cx.files.return_value
+        session = MagicMock()
+        session.get.side_effect = lambda uri, **kw: media_response(b'pdf')
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            result = mock_drive.download_many(
+                ['/TestDrive/a.pdf', '/TestDrive/b.pdf'], directory=str(tmp_path))
+        assert result == {
+            '/TestDrive/a.pdf': str(tmp_path / 'a.pdf'),
+            '/TestDrive/b.pdf': str(tmp_path / 'b.pdf'),
+        }
+        fetched = {c.kwargs['fileId'] for c in files.get_media.call_args_list}
+        assert fetched == {'id_a', 'id_b'}
+        assert (tmp_path / 'b.pdf').read_bytes() == b'pdf'
+
+    def test_download_many_raises_after_all_attempts(self, mock_drive, mock_cx, tmp_path):
+        """Verify a failed download is raised once the others have run.
+        """
+        mock_drive._cache_files('/TestDrive', [
+            file_entry('a.pdf', 'id_a'), file_entry('b.pdf', 'id_b')])
+        session = MagicMock()
+        session.get.side_effect = [OSError('boom'), media_response(b'pdf')]
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            with pytest.raises(OSError, match='boom'):
+                mock_drive.download_many(
+                    ['/TestDrive/a.pdf', '/TestDrive/b.pdf'], directory=str(tmp_path))
+        assert session.get.call_count == 2
+
+    def test_download_many_rejects_duplicate_names(self, mock_drive, mock_cx, tmp_path):
+        """Verify paths that share a file name raise before any download starts.
+        """
+        session = MagicMock()
+        with patch.object(type(mock_drive), '_thread_session', return_value=session):
+            with pytest.raises(ValueError, match='report.csv'):
+                mock_drive.download_many(
+                    ['/TestDrive/A/report.csv', '/TestDrive/B/report.csv'],
+                    directory=str(tmp_path))
+        session.get.assert_not_called()
+        mock_cx.files.return_value.list.assert_not_called()
+
+    def test_download_many_uses_configured_workers(self, mock_drive, mock_cx, tmp_path,
+                                                   clean_settings):
+        """Verify the max_workers setting sizes the download pool.
+        """
+        mock_drive._cache_files('/TestDrive', [file_entry('a.pdf', 'id_a')])
+        session = MagicMock()
+        session.get.side_effect = lambda uri, **kw: media_response(b'pdf')
+        goog.configure(max_workers=3)
+        with patch.object(type(mock_drive), '_thread_session', return_value=session), \
+                patch('goog.drive.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+            mock_drive.download_many(['/TestDrive/a.pdf'], directory=str(tmp_path))
+        pool.assert_called_once_with(max_workers=3)
 
     def test_download_missing_directory_raises(self, mock_drive, mock_cx):
         """Verify download raises when no directory configured.
@@ -1238,7 +1669,7 @@ class TestWrite:
         files.list.return_value.execute.return_value = empty
 
         request_mock = MagicMock()
-        request_mock.next_chunk.return_value = (None, {'name': 'test.txt', 'id': 'new_id'})
+        request_mock.execute.return_value = {'name': 'test.txt', 'id': 'new_id'}
         files.create.return_value = request_mock
 
         with patch('goog.drive.MediaIoBaseUpload'):
@@ -1250,6 +1681,121 @@ class TestWrite:
         assert call_kwargs['body']['name'] == 'test.txt'
         assert call_kwargs['body']['parents'] == ['root123']
 
+    def test_write_small_bytes_single_request(self, mock_drive, mock_cx):
+        """Verify payloads under the threshold skip the resumable session.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        request_mock = MagicMock()
+        request_mock.execute.return_value = {'name': 'test.txt', 'id': 'new_id'}
+        files.create.return_value = request_mock
+
+        with patch('goog.drive.MediaIoBaseUpload') as mock_upload:
+            mock_drive.write(b'hello', 'test.txt', '/TestDrive',
+                             mimetype='text/plain')
+
+        assert mock_upload.call_args.kwargs['resumable'] is False
+        assert mock_upload.call_args.args[0].getvalue() == b'hello'
+        request_mock.execute.assert_called_once_with(num_retries=5)
+        request_mock.next_chunk.assert_not_called()
+
+    def test_write_large_bytes_resumable(self, mock_drive, mock_cx, clean_settings):
+        """Verify payloads at or above the threshold upload in chunks.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        request_mock = MagicMock()
+        request_mock.next_chunk.return_value = (None, {'name': 'big.bin', 'id': 'new_id'})
+        files.create.return_value = request_mock
+        goog.configure(resumable_threshold=4)
+
+        with patch('goog.drive.MediaIoBaseUpload') as mock_upload:
+            mock_drive.write(b'hello', 'big.bin', '/TestDrive',
+                             mimetype='application/octet-stream')
+
+        assert mock_upload.call_args.kwargs['resumable'] is True
+        request_mock.next_chunk.assert_called_once()
+        request_mock.execute.assert_not_called()
+
+    def test_write_progress_callback(self, mock_drive, mock_cx, clean_settings):
+        """Verify a progress callback replaces the tqdm bar for resumable uploads.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        status = MagicMock(resumable_progress=2, total_size=5)
+        request_mock = MagicMock()
+        request_mock.next_chunk.side_effect = [
+            (status, None), (None, {'name': 'big.bin', 'id': 'new_id'})]
+        files.create.return_value = request_mock
+        goog.configure(resumable_threshold=4)
+        calls = []
+
+        with patch('goog.drive.MediaIoBaseUpload') as mock_upload, \
+             patch('goog.drive.tqdm') as mock_tqdm:
+            mock_upload.return_value.size.return_value = 5
+            mock_drive.write(b'hello', 'big.bin', '/TestDrive',
+                             mimetype='application/octet-stream',
+                             progress=lambda sent, total: calls.append((sent, total)))
+
+        assert calls == [(2, 5), (5, 5)]
+        mock_tqdm.assert_not_called()
+
+    def test_write_no_bar_without_tty(self, mock_drive, mock_cx, clean_settings, capsys):
+        """Verify resumable uploads draw no tqdm bar when stderr is not a TTY.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        status = MagicMock(resumable_progress=2, total_size=5)
+        status.progress.return_value = 0.4
+        request_mock = MagicMock()
+        request_mock.next_chunk.side_effect = [
+            (status, None), (None, {'name': 'big.bin', 'id': 'new_id'})]
+        files.create.return_value = request_mock
+        goog.configure(resumable_threshold=4)
+
+        with patch('goog.drive.MediaIoBaseUpload'):
+            mock_drive.write(b'hello', 'big.bin', '/TestDrive',
+                             mimetype='application/octet-stream')
+
+        assert capsys.readouterr().err == ''
+
+    def test_write_upload_chunksize(self, mock_drive, mock_cx, tmp_path, clean_settings):
+        """Verify resumable uploads use the explicit or configured chunksize.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        request_mock = MagicMock()
+        request_mock.next_chunk.return_value = (None, {'name': 'up.bin', 'id': 'new_id'})
+        files.create.return_value = request_mock
+        local_file = tmp_path / 'up.bin'
+        local_file.write_bytes(b'x' * 16)
+        goog.configure(resumable_threshold=1, upload_chunksize=8 * 1024 * 1024)
+
+        with patch('goog.drive.MediaFileUpload') as mock_upload:
+            mock_drive.write(str(local_file), 'up.bin', '/TestDrive',
+                             mimetype='application/octet-stream')
+            assert mock_upload.call_args.kwargs['chunksize'] == 8 * 1024 * 1024
+            mock_drive.write(str(local_file), 'up.bin', '/TestDrive',
+                             mimetype='application/octet-stream', chunksize=1024 * 1024)
+            assert mock_upload.call_args.kwargs['chunksize'] == 1024 * 1024
+
+    def test_write_small_stream_single_request(self, mock_drive, mock_cx):
+        """Verify a seekable stream below the threshold skips the resumable session.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.return_value = {'name': 's.bin', 'id': 'x'}
+        stream = io.BytesIO(b'header small body')
+        stream.seek(7)
+
+        with patch('goog.drive.MediaIoBaseUpload') as mock_upload:
+            mock_drive.write(stream, 's.bin', '/TestDrive',
+                             mimetype='application/octet-stream')
+
+        assert mock_upload.call_args.kwargs['resumable'] is False
+        assert stream.tell() == 7
+        files.create.return_value.next_chunk.assert_not_called()
+
     def test_write_from_filepath(self, mock_drive, mock_cx, tmp_path):
         """Verify write from local file path.
         """
@@ -1261,7 +1807,7 @@ class TestWrite:
         local_file.write_text('content')
 
         request_mock = MagicMock()
-        request_mock.next_chunk.return_value = (None, {'name': 'upload.txt', 'id': 'new_id'})
+        request_mock.execute.return_value = {'name': 'upload.txt', 'id': 'new_id'}
         files.create.return_value = request_mock
 
         with patch('goog.drive.MediaFileUpload'):
@@ -1271,6 +1817,110 @@ class TestWrite:
         files.create.assert_called_once()
 
 
+    def test_write_mkdir_p_skips_exists_walk(self, mock_drive, mock_cx):
+        """Verify mkdir_p creates missing folders without a separate exists() walk.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.side_effect = [
+            {'id': 'folder_a'}, {'id': 'folder_b'}, {'name': 'f.txt', 'id': 'new_id'}]
+
+        with patch('goog.drive.MediaIoBaseUpload'):
+            mock_drive.write(b'x', 'f.txt', '/TestDrive/a/b', mimetype='text/plain',
+                             mkdir_p=True)
+
+        assert files.create.call_args.kwargs['body']['parents'] == ['folder_b']
+        assert files.list.return_value.execute.call_count == 2
+
+    def test_write_guesses_mimetype_from_extension(self, mock_drive, mock_cx):
+        """Verify the extension map picks the mimetype without sniffing bytes.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.return_value = {'name': 'a.CSV', 'id': 'x'}
+
+        with patch('goog.drive.MediaIoBaseUpload') as media, \
+                patch('goog.drive.filetype.guess_mime') as sniff:
+            mock_drive.write(b'a,b', 'a.CSV', '/TestDrive')
+
+        assert media.call_args[1]['mimetype'] == 'text/csv'
+        sniff.assert_not_called()
+
+    @pytest.mark.parametrize('fname', ['a.tgz', 'a.tar.gz'])
+    def test_write_guesses_compressed_mimetype(self, mock_drive, mock_cx, fname):
+        """Verify suffix and encoding maps resolve compressed archives.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.return_value = {'name': fname, 'id': 'x'}
+
+        with patch('goog.drive.MediaIoBaseUpload') as media:
+            mock_drive.write(b'data', fname, '/TestDrive')
+
+        assert media.call_args[1]['mimetype'] == 'application/x-tar'
+
+    def test_write_default_mimetype(self, mock_drive, mock_cx):
+        """Verify unknown extensions on raw data use default_mimetype.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.return_value = {'name': 'blob', 'id': 'x'}
+
+        with pytest.raises(ValueError):
+            mock_drive.write(b'data', 'blob', '/TestDrive')
+
+        with patch('goog.drive.MediaIoBaseUpload') as media:
+            mock_drive.write(b'data', 'blob', '/TestDrive',
+                             default_mimetype='application/octet-stream')
+
+        assert media.call_args[1]['mimetype'] == 'application/octet-stream'
+
+
+    def test_write_many_uploads_each_item(self, mock_drive, mock_cx):
+        """Verify write_many uploads every item on a per-worker http.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        requests = []
+
+        def create(media_body, body, **kw):
+            request = MagicMock()
+            request.execute.return_value = {'name': body['name'], 'id': f"id_{body['name']}"}
+            requests.append(request)
+            return request
+        files.create.side_effect = create
+        http = MagicMock()
+
+        with patch('goog.drive.MediaIoBaseUpload'), \
+                patch.object(type(mock_drive), '_thread_http', return_value=http):
+            result = mock_drive.write_many([
+                (b'a', 'a.txt', '/TestDrive'),
+                (b'b', 'b.txt', '/TestDrive'),
+                ])
+
+        assert result == {'/TestDrive/a.txt': 'id_a.txt', '/TestDrive/b.txt': 'id_b.txt'}
+        assert all(r.http is http for r in requests)
+        assert {c.kwargs['body']['parents'][0] for c in files.create.call_args_list} == {'root123'}
+
+    def test_write_many_raises_after_all_attempts(self, mock_drive, mock_cx):
+        """Verify a failed upload is raised once the others have run.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.side_effect = [
+            OSError('boom'), {'name': 'b.txt', 'id': 'id_b'}]
+
+        with patch('goog.drive.MediaIoBaseUpload'), \
+                patch.object(type(mock_drive), '_thread_http'):
+            with pytest.raises(OSError, match='boom'):
+                mock_drive.write_many([
+                    (b'a', 'a.txt', '/TestDrive'),
+                    (b'b', 'b.txt', '/TestDrive'),
+                    ], max_workers=1)
+
+        assert files.create.return_value.execute.call_count == 2
+
+
 class TestCacheBehavior:
     """Tests for folder resolution caching.
     """
@@ -1287,6 +1937,97 @@ class TestCacheBehavior:
         assert r1 == r2 == 'folder_sub'
         assert files.list.return_value.execute.call_count == 1
 
+    def test_resolve_folderid_memoizes_path(self, mock_drive, mock_cx):
+        """Verify a resolved folder path skips the per-segment lookups.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([]),
+            files_list_response([folder_entry('a', 'id_a')]),
+            files_list_response([folder_entry('b', 'id_b')]),
+        ]
+        assert mock_drive._resolve_folderid('/TestDrive/a/b/') == 'id_b'
+        with patch.object(type(mock_drive), '_resolve_segment') as mock_segment:
+            assert mock_drive._resolve_folderid('/TestDrive/a/b/') == 'id_b'
+        mock_segment.assert_not_called()
+
+    def test_resolve_folderid_chain_in_one_listing(self, mock_drive, mock_cx):
+        """Verify a deep uncached path resolves from a single drive-wide listing.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response([
+            {**folder_entry('a', 'id_a'), 'parents': ['root123']},
+            {**folder_entry('b', 'id_b'), 'parents': ['id_a']},
+            {**folder_entry('c', 'id_c'), 'parents': ['id_b']},
+            {**folder_entry('b', 'id_other'), 'parents': ['id_elsewhere']},
+        ])
+        assert mock_drive._resolve_folderid('/TestDrive/a/b/c/') == 'id_c'
+        assert files.list.return_value.execute.call_count == 1
+        kwargs = files.list.call_args.kwargs
+        assert kwargs['corpora'] == 'drive'
+        assert kwargs['driveId'] == 'root123'
+
+    def test_resolve_folderid_chain_falls_back_when_ambiguous(self, mock_drive, mock_cx):
+        """Verify duplicate names under one parent fall back to per-segment lookups.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.side_effect = [
+            files_list_response([
+                {**folder_entry('a', 'id_a1'), 'parents': ['root123']},
+                {**folder_entry('a', 'id_a2'), 'parents': ['root123']},
+            ]),
+            files_list_response([folder_entry('a', 'id_a1')]),
+            files_list_response([folder_entry('b', 'id_b')]),
+        ]
+        assert mock_drive._resolve_folderid('/TestDrive/a/b/') == 'id_b'
+        assert files.list.return_value.execute.call_count == 3
+
+    def test_resolve_folderid_skips_chain_for_non_shared_root(self, mock_drive, mock_cx):
+        """Verify a root rejected by the drive-wide listing is not listed again.
+        """
+        files = mock_cx.files.return_value
+        not_shared = HttpError(MagicMock(status=404),
+                               b'{"error": {"code": 404, "message": "Shared drive not found"}}')
+
+        def _list(**kw):
+            request = MagicMock()
+            if kw.get('corpora') == 'drive':
+                request.execute.side_effect = not_shared
+            else:
+                name = kw['q'].split("'")[1]
+                request.execute.return_value = files_list_response(
+                    [folder_entry(name, f'id_{name}')])
+            return request
+
+        files.list.side_effect = _list
+        assert mock_drive._resolve_folderid('/Other/a/b/') == 'id_b'
+        assert mock_drive._resolve_folderid('/Other/x/y/') == 'id_y'
+        chain_calls = [c for c in files.list.call_args_list if c.kwargs.get('corpora') == 'drive']
+        assert len(chain_calls) == 1
+        assert chain_calls[0].kwargs['driveId'] == 'root456'
+
+    def test_clear_cache_drops_memoized_paths(self, mock_drive, mock_cx):
+        """Verify clear_cache also forgets whole-path folder lookups.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response(
+            [folder_entry('a', 'id_a')])
+        mock_drive._resolve_folderid('/TestDrive/a/')
+        mock_drive.clear_cache()
+        mock_drive._resolve_folderid('/TestDrive/a/')
+        assert files.list.return_value.execute.call_count == 2
+
+    def test_resolve_segment_requests_single_id(self, mock_drive, mock_cx):
+        """Verify single-hit lookups ask for one id-only result per page.
+        """
+        files = mock_cx.files.return_value
+        files.list.return_value.execute.return_value = files_list_response(
+            [folder_entry('sub', 'folder_sub')])
+        mock_drive._resolve_segment('root123', 'sub')
+        kwargs = files.list.call_args.kwargs
+        assert kwargs['pageSize'] == 1
+        assert kwargs['fields'] == 'nextPageToken, files(id)'
+
     def test_clear_cache_invalidates(self, mock_drive, mock_cx):
         """Verify clear_cache forces fresh API call.
         """
@@ -1382,16 +2123,71 @@ class TestMakedirs:
         with pytest.raises(LookupError, match='Unknown Shared Drive'):
             mock_drive.makedirs('/BadDrive/sub')
 
-    def test_makedirs_clears_cache(self, mock_drive, mock_cx):
-        """Verify makedirs clears folder cache after creation.
+    def test_makedirs_caches_created_folders(self, mock_drive, mock_cx):
+        """Verify folders created by makedirs resolve later without an API call.
         """
         files = mock_cx.files.return_value
-        sub_resp = files_list_response([folder_entry('sub', 'folder_sub')])
-        files.list.return_value.execute.return_value = sub_resp
-        mock_drive.clear_cache()
-        mock_drive.makedirs('/TestDrive/sub')
-        mock_drive._resolve_segment('root123', 'sub')
-        assert files.list.return_value.execute.call_count >= 2
+        files.list.return_value.execute.return_value = files_list_response([])
+        files.create.return_value.execute.side_effect = [
+            {'id': 'new_sub'}, {'id': 'new_deep'}]
+        mock_drive.makedirs('/TestDrive/sub/deep')
+        assert files.list.return_value.execute.call_count == 1
+        assert mock_drive._resolve_segment('root123', 'sub') == 'new_sub'
+        assert mock_drive._resolve_segment('new_sub', 'deep') == 'new_deep'
+        assert files.list.return_value.execute.call_count == 1
+
+
+class TestPrefetchChildren:
+    """Tests for prefetch_children() segment cache seeding.
+    """
+
+    def test_prefetch_caches_subfolders(self, mock_drive, mock_cx):
+        """Verify one listing caches every subfolder segment.
+        """
+        files = mock_cx.files.return_value
+        listing = files_list_response([
+            folder_entry('a', 'folder_a'),
+            folder_entry('b', 'folder_b'),
+            ])
+        files.list.return_value.execute.return_value = listing
+        count = mock_drive.prefetch_children('/TestDrive/')
+        assert count == 2
+        query = files.list.call_args[1]['q']
+        assert "'root123' in parents" in query
+        assert FOLDER_MIME in query
+        calls = files.list.return_value.execute.call_count
+        assert mock_drive._resolve_segment('root123', 'a') == 'folder_a'
+        assert mock_drive._resolve_segment('root123', 'b') == 'folder_b'
+        assert files.list.return_value.execute.call_count == calls
+
+    def test_prefetch_keeps_first_duplicate(self, mock_drive, mock_cx):
+        """Verify duplicate names cache the first match like _resolve_segment.
+        """
+        files = mock_cx.files.return_value
+        listing = files_list_response([
+            folder_entry('dup', 'first'),
+            folder_entry('dup', 'second'),
+            ])
+        files.list.return_value.execute.return_value = listing
+        mock_drive.prefetch_children('/TestDrive/')
+        assert mock_drive._resolve_segment('root123', 'dup') == 'first'
+
+    def test_prefetch_include_files_seeds_file_ids(self, mock_drive, mock_cx):
+        """Verify include_files caches file ids from the same listing.
+        """
+        files = mock_cx.files.return_value
+        listing = files_list_response([
+            folder_entry('a', 'folder_a'),
+            file_entry('report.pdf', 'file_report'),
+            ])
+        files.list.return_value.execute.return_value = listing
+        count = mock_drive.prefetch_children('/TestDrive', include_files=True)
+        assert count == 2
+        assert FOLDER_MIME not in files.list.call_args[1]['q']
+        calls = files.list.return_value.execute.call_count
+        assert mock_drive.id('/TestDrive/report.pdf') == 'file_report'
+        assert mock_drive._resolve_segment('root123', 'a') == 'folder_a'
+        assert files.list.return_value.execute.call_count == calls
 
 
 class TestListChildren:
@@ -1436,10 +2232,9 @@ class TestDeleteExtended:
         """Verify delete works for folders via filepath form.
         """
         files = mock_cx.files.return_value
-        empty = files_list_response([])
         folder_resp = files_list_response(
             [folder_entry('old_dir', 'folder_old')])
-        files.list.return_value.execute.side_effect = [empty, folder_resp]
+        files.list.return_value.execute.side_effect = [folder_resp]
         files.delete.return_value.execute.return_value = None
         mock_drive.delete('/TestDrive/old_dir')
         files.delete.assert_called_once()
@@ -1,8 +1,13 @@
 """Mock integration tests for Gmail module.
 """
 import base64
+import email
+import threading
+from unittest.mock import MagicMock, patch
 
+import filetype
 import pytest
+from tests.fixtures.drive_responses import http_error_from_fixture
 
 
 class TestBuildKw:
@@ -26,7 +31,7 @@ class TestGetEmails:
     """Tests for get_emails() generator.
     """
 
-    def test_yields_messages(self, gmail, mock_cx):
+    def test_yields_messages(self, gmail, mock_cx, fake_batches):
         """Verify get_emails yields parsed email.message.Message objects.
         """
         messages = mock_cx.users.return_value.messages.return_value
@@ -43,7 +48,7 @@ class TestGetEmails:
         assert len(results) == 1
         assert results[0]['Subject'] == 'Test'
 
-    def test_pagination(self, gmail, mock_cx):
+    def test_pagination(self, gmail, mock_cx, fake_batches):
         """Verify get_emails follows nextPageToken.
         """
         messages = mock_cx.users.return_value.messages.return_value
@@ -62,8 +67,101 @@ class TestGetEmails:
         messages.get.return_value.execute.return_value = {
             'raw': encoded, 'snippet': '',
         }
-        results = list(gmail.get_emails(q='subject:X'))
+        with patch.object(type(gmail), '_thread_http'):
+            results = list(gmail.get_emails(q='subject:X'))
         assert len(results) == 2
+        assert len(fake_batches) == 2
+
+    def test_batches_page_in_groups(self, gmail, mock_cx, fake_batches):
+        """Verify a page of messages is fetched in batches of GMAIL_BATCH_LIMIT.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        encoded = base64.urlsafe_b64encode(b'Subject: X\r\n\r\n').decode('ascii')
+        messages.list.return_value.execute.return_value = {
+            'resultSizeEstimate': 120,
+            'messages': [{'id': f'msg_{i}'} for i in range(120)],
+        }
+        messages.get.return_value.execute.return_value = {'raw': encoded, 'snippet': ''}
+        results = list(gmail.get_emails(q='subject:X'))
+        assert len(results) == 120
+        assert [len(b.requests) for b in fake_batches] == [50, 50, 20]
+
+    def test_failed_batch_entry_retried_individually(self, gmail, mock_cx, fake_batches):
+        """Verify a message that fails inside the batch is retried on its own.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        encoded = base64.urlsafe_b64encode(b'Subject: Retry\r\n\r\n').decode('ascii')
+        messages.list.return_value.execute.return_value = {
+            'resultSizeEstimate': 1,
+            'messages': [{'id': 'msg_1'}],
+        }
+        messages.get.return_value.execute.side_effect = [
+            http_error_from_fixture('files_update_rate_limit_exceeded'),
+            {'raw': encoded, 'snippet': ''},
+        ]
+        results = list(gmail.get_emails(q='subject:Retry'))
+        assert [m['Subject'] for m in results] == ['Retry']
+        assert messages.get.return_value.execute.call_args.kwargs == {'num_retries': 3}
+
+
+    def test_metadata_format_returns_headers(self, gmail, mock_cx, fake_batches):
+        """Verify format='metadata' requests headers only and builds messages from them.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {
+            'resultSizeEstimate': 1,
+            'messages': [{'id': 'msg_1'}],
+        }
+        messages.get.return_value.execute.return_value = {
+            'snippet': '',
+            'payload': {'headers': [
+                {'name': 'From', 'value': 'a@b.com'},
+                {'name': 'Subject', 'value': 'Meta'},
+            ]},
+        }
+        results = list(gmail.get_emails(format='metadata', q='subject:Meta'))
+        assert results[0]['Subject'] == 'Meta'
+        assert results[0].get_payload() is None
+        call_kwargs = messages.get.call_args.kwargs
+        assert call_kwargs['format'] == 'metadata'
+        assert call_kwargs['metadataHeaders'] == ['From', 'Subject', 'Date']
+
+    def test_get_email_ids_skips_message_fetch(self, gmail, mock_cx):
+        """Verify get_email_ids pages through the list without fetching messages.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.list.return_value.execute.side_effect = [
+            {'resultSizeEstimate': 2, 'messages': [{'id': 'msg_1'}], 'nextPageToken': 'tok2'},
+            {'resultSizeEstimate': 2, 'messages': [{'id': 'msg_2'}]},
+        ]
+        with patch.object(type(gmail), '_thread_http'):
+            assert list(gmail.get_email_ids(q='subject:X')) == ['msg_1', 'msg_2']
+        messages.get.assert_not_called()
+
+    def test_next_page_prefetched_on_thread_http(self, gmail, mock_cx):
+        """Verify the next page is listed ahead with the worker thread's http.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        execute = messages.list.return_value.execute
+        execute.side_effect = [
+            {'resultSizeEstimate': 2, 'messages': [{'id': 'msg_1'}], 'nextPageToken': 'tok2'},
+            {'resultSizeEstimate': 2, 'messages': [{'id': 'msg_2'}]},
+        ]
+        http = MagicMock()
+        threads = []
+
+        def _thread_http():
+            threads.append(threading.current_thread().name)
+            return http
+
+        with patch.object(type(gmail), '_thread_http', side_effect=_thread_http):
+            ids = gmail.get_email_ids(q='subject:X')
+            assert next(ids) == 'msg_1'
+            assert list(ids) == ['msg_2']
+        assert execute.call_args_list[0].kwargs['http'] is None
+        assert execute.call_args_list[1].kwargs['http'] is http
+        assert messages.list.call_args_list[1].kwargs['pageToken'] == 'tok2'
+        assert threads and threads[0].startswith('goog-prefetch')
 
 
 class TestMarkAs:
@@ -83,12 +181,44 @@ class TestMarkAs:
             'messages': [{'id': 'msg_1'}],
         }
         messages.list.return_value.execute.return_value = list_resp
-        messages.modify.return_value.execute.return_value = {}
+        messages.batchModify.return_value.execute.return_value = {}
         gmail.mark_as('UNREAD', add=add, q='subject:test')
-        messages.modify.assert_called_once()
-        call_kwargs = messages.modify.call_args[1]
-        assert expected_key in call_kwargs['body']
+        messages.batchModify.assert_called_once()
+        call_kwargs = messages.batchModify.call_args[1]
+        assert call_kwargs['body']['ids'] == ['msg_1']
         assert call_kwargs['body'][expected_key] == ['UNREAD']
+        messages.modify.assert_not_called()
+
+    def test_mark_as_one_request_per_page(self, gmail, mock_cx):
+        """Verify each page is modified with one batchModify call.
+        """
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.list.return_value.execute.side_effect = [
+            {'resultSizeEstimate': 3, 'messages': [{'id': 'a'}, {'id': 'b'}], 'nextPageToken': 't'},
+            {'resultSizeEstimate': 3, 'messages': [{'id': 'c'}]},
+        ]
+        with patch.object(type(gmail), '_thread_http'):
+            gmail.mark_as('UNREAD', q='is:unread')
+        bodies = [c.kwargs['body'] for c in messages.batchModify.call_args_list]
+        assert bodies == [{'ids': ['a', 'b'], 'removeLabelIds': ['UNREAD']},
+                          {'ids': ['c'], 'removeLabelIds': ['UNREAD']}]
+
+
+    def test_mark_as_resolves_label_name_once(self, gmail, mock_cx):
+        """Verify user label names are mapped to IDs with a single labels.list.
+        """
+        users = mock_cx.users.return_value
+        users.labels.return_value.list.return_value.execute.return_value = {
+            'labels': [{'name': 'UNREAD', 'id': 'UNREAD'}, {'name': 'Reports', 'id': 'Label_7'}]}
+        messages = users.messages.return_value
+        messages.list.return_value.execute.return_value = {
+            'resultSizeEstimate': 1, 'messages': [{'id': 'msg_1'}]}
+        gmail.mark_as('Reports', add=True, q='subject:report')
+        gmail.mark_as('UNREAD', q='subject:report')
+        bodies = [c.kwargs['body'] for c in messages.batchModify.call_args_list]
+        assert bodies[0]['addLabelIds'] == ['Label_7']
+        assert bodies[1]['removeLabelIds'] == ['UNREAD']
+        users.labels.return_value.list.assert_called_once_with(userId='test@example.com')
 
 
 class TestSendMail:
@@ -124,6 +254,75 @@ class TestSendMail:
         finally:
             goog.base._settings.update(original)
 
+    def test_attachment_read_once(self, gmail, mock_cx, tmp_path):
+        """Verify attachments are sniffed from one read and unknown types fall back.
+        """
+        png = tmp_path / 'pic.png'
+        png.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 5000)
+        blob = tmp_path / 'notes.dat'
+        blob.write_bytes(b'plain bytes')
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.send.return_value.execute.return_value = {'id': 'sent_3'}
+        with patch('goog.gmail.filetype.guess', wraps=filetype.guess) as guess:
+            gmail.send_mail('to@example.com', 'Files', 'Body',
+                            sender='from@example.com',
+                            attachments=[str(png), str(blob)])
+        assert all(isinstance(c.args[0], bytes) for c in guess.call_args_list)
+        assert all(len(c.args[0]) <= 4096 for c in guess.call_args_list)
+        raw = messages.send.call_args[1]['body']['raw']
+        msg = email.message_from_bytes(base64.urlsafe_b64decode(raw))
+        types = [p.get_content_type() for p in msg.get_payload()[1:]]
+        assert types == ['image/png', 'application/octet-stream']
+
+    def test_binary_attachment_base64_encoded(self, gmail, mock_cx, tmp_path):
+        """Verify generic binary attachments are base64 encoded and round-trip.
+        """
+        blob = tmp_path / 'data.bin'
+        payload = bytes(range(256)) * 4
+        blob.write_bytes(payload)
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.send.return_value.execute.return_value = {'id': 'sent_4'}
+        gmail.send_mail('to@example.com', 'Bin', 'Body', sender='from@example.com',
+                        attachments=[str(blob)])
+        raw = messages.send.call_args[1]['body']['raw']
+        part = email.message_from_bytes(base64.urlsafe_b64decode(raw)).get_payload()[1]
+        assert part['Content-Transfer-Encoding'] == 'base64'
+        assert part.get_payload(decode=True) == payload
+
+    def test_send_bulk_builds_attachments_once(self, gmail, mock_cx, tmp_path):
+        """Verify send_bulk sends one message per recipient sharing attachment parts.
+        """
+        png = tmp_path / 'pic.png'
+        png.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 100)
+        messages = mock_cx.users.return_value.messages.return_value
+        messages.send.return_value.execute.return_value = {'id': 'sent'}
+        with patch('goog.gmail.filetype.guess', wraps=filetype.guess) as guess:
+            results = gmail.send_bulk(['a@b.com', 'c@d.com'], 'Report', 'Body',
+                                      sender='from@example.com', attachments=[str(png)])
+        assert len(results) == 2
+        guess.assert_called_once()
+        sent = [email.message_from_bytes(base64.urlsafe_b64decode(c.kwargs['body']['raw']))
+                for c in messages.send.call_args_list]
+        assert [m['to'] for m in sent] == ['a@b.com', 'c@d.com']
+        assert all(m.get_payload()[1].get_filename() == 'pic.png' for m in sent)
+
+    def test_large_message_uses_resumable_upload(self, gmail, mock_cx, clean_settings):
+        """Verify messages over the resumable threshold are uploaded as rfc822 media.
+        """
+        import goog
+        goog.configure(resumable_threshold=10)
+        messages = mock_cx.users.return_value.messages.return_value
+        request = messages.send.return_value
+        request.next_chunk.side_effect = [(MagicMock(), None), (None, {'id': 'sent_big'})]
+        with patch('goog.gmail.MediaIoBaseUpload') as upload:
+            result = gmail.send_mail('to@example.com', 'Big', 'Body', sender='from@example.com')
+        assert result['id'] == 'sent_big'
+        assert upload.call_args.kwargs['mimetype'] == 'message/rfc822'
+        assert upload.call_args.kwargs['resumable'] is True
+        assert messages.send.call_args.kwargs['media_body'] is upload.return_value
+        assert 'raw' not in messages.send.call_args.kwargs['body']
+        request.execute.assert_not_called()
+
     def test_multiple_recipients(self, gmail, mock_cx):
         """Verify multiple recipients are joined.
         """
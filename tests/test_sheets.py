@@ -22,9 +22,9 @@ class TestGetIterdict:
         mock_gx.open_by_key.return_value = mock_spreadsheet
         mock_dx.id.return_value = 'sheet_id_1'
 
-        mock_worksheet.get.side_effect = [
-            [['Name', 'Value', 'Pct']],
-            [['Alice', '1,234', '45.6%'], ['Bob', '(500)', '10%']],
+        mock_worksheet.batch_get.return_value = [
+            [['Name', 'Value', '', 'Pct']],
+            [['Alice', '1,234', 'x', '45.6%'], ['Bob', '(500)', 'y', '10%']],
         ]
         mock_worksheet.row_count = 10
 
@@ -32,6 +32,34 @@ class TestGetIterdict:
         assert len(result) == 2
         assert result[0] == {'Name': 'Alice', 'Value': 1234, 'Pct': 45.6}
         assert result[1] == {'Name': 'Bob', 'Value': -500, 'Pct': 10}
+        mock_worksheet.batch_get.assert_called_once_with(['A1:ZZ1', 'A2:ZZ10'])
+        mock_worksheet.get.assert_not_called()
+
+    def test_unformatted_values_pass_through(self, mock_sheets):
+        """Verify unformatted reads request typed values and skip _fmt for them.
+        """
+        sheets, mock_gx, mock_dx = mock_sheets
+
+        mock_worksheet = MagicMock()
+        mock_worksheet.title = 'Sheet1'
+        mock_spreadsheet = MagicMock()
+        mock_spreadsheet.title = 'TestBook'
+        mock_spreadsheet.worksheets.return_value = [mock_worksheet]
+        mock_gx.open_by_key.return_value = mock_spreadsheet
+        mock_dx.id.return_value = 'sheet_id_1'
+
+        mock_worksheet.batch_get.return_value = [
+            [['Name', 'Value', 'Pct', 'Done']],
+            [['Alice', 1234.5, 0.456, True], ['Bob', 1e20, '', False]],
+        ]
+        mock_worksheet.row_count = 10
+
+        result = sheets.get_iterdict('/TestDrive/TestBook', unformatted=True)
+        assert result[0] == {'Name': 'Alice', 'Value': 1234.5, 'Pct': 0.456, 'Done': True}
+        assert result[1] == {'Name': 'Bob', 'Value': 1e20, 'Pct': None, 'Done': False}
+        kwargs = mock_worksheet.batch_get.call_args.kwargs
+        assert kwargs['value_render_option'] == 'UNFORMATTED_VALUE'
+        assert kwargs['date_time_render_option'] == 'FORMATTED_STRING'
 
     def test_empty_sheet(self, mock_sheets):
         """Verify get_iterdict handles empty data.
@@ -46,7 +74,7 @@ class TestGetIterdict:
         mock_gx.open_by_key.return_value = mock_spreadsheet
         mock_dx.id.return_value = 'sheet_id_1'
 
-        mock_worksheet.get.side_effect = [
+        mock_worksheet.batch_get.return_value = [
             [['Name', 'Value']],
             [],
         ]
@@ -70,7 +98,7 @@ class TestGetIterdict:
         mock_gx.open_by_key.return_value = mock_spreadsheet
         mock_dx.id.return_value = 'sheet_id_1'
 
-        sheet2.get.side_effect = [
+        sheet2.batch_get.return_value = [
             [['Col1']],
             [['data']],
         ]
@@ -111,6 +139,69 @@ class TestIdCaching:
         assert r1 == r2 == 'resolved_id'
         assert mock_dx.id.call_count == 1
 
+    def test_delete_invalidates_cached_id(self, mock_sheets):
+        """Verify del_spreadsheet drops the cached id here and in Drive.
+        """
+        sheets, mock_gx, mock_dx = mock_sheets
+        mock_dx.id.side_effect = ['old_id', 'new_id']
+        sheets.id('/TestDrive/Sheet1')
+        sheets.del_spreadsheet('/TestDrive/Sheet1')
+        mock_gx.del_spreadsheet.assert_called_once_with('old_id')
+        mock_dx._forget_file.assert_called_once_with('/TestDrive/Sheet1')
+        assert sheets.id('/TestDrive/Sheet1') == 'new_id'
+
+
+class TestLazyDrive:
+    """Tests for deferred Drive construction.
+    """
+
+    def test_drive_built_on_first_use(self, mock_sheets):
+        """Verify Drive is only constructed when a path must be resolved.
+        """
+        from goog.sheets import Drive
+        sheets, mock_gx, mock_dx = mock_sheets
+        Drive.assert_not_called()
+        sheets.id('/TestDrive/Sheet1')
+        sheets.id('/TestDrive/Sheet2')
+        Drive.assert_called_once_with(account='test@example.com', key='/fake/key.json',
+                                      scopes=['https://spreadsheets.google.com/feeds'])
+
+    def test_injected_drive_used(self, mock_sheets):
+        """Verify a dx passed in is used without building another Drive.
+        """
+        from goog.sheets import Drive, Sheets
+        dx = MagicMock()
+        dx.id.return_value = 'injected_id'
+        sheets = Sheets(dx=dx)
+        assert sheets.id('/TestDrive/Sheet1') == 'injected_id'
+        Drive.assert_not_called()
+
+
+class TestRemovePermissions:
+    """Tests for remove_permissions() bulk revocation.
+    """
+
+    def test_one_listing_and_batched_deletes(self, mock_sheets):
+        """Verify permissions are listed once and deleted in one batch call.
+        """
+        sheets, mock_gx, mock_dx = mock_sheets
+        mock_dx.id.return_value = 'file_1'
+        mock_gx.list_permissions.return_value = [
+            {'emailAddress': 'a@x.com', 'id': 'p_a'},
+            {'emailAddress': 'b@x.com', 'id': 'p_b'},
+            {'id': 'anyone'},
+        ]
+        delete = mock_dx.cx.permissions.return_value.delete
+        mock_dx._execute_batch.side_effect = lambda reqs: {k: {} for k, _ in reqs}
+
+        result = sheets.remove_permissions('/TestDrive/Sheet1', ['a@x.com', 'b@x.com', 'c@x.com'])
+
+        assert result == {'a@x.com': {}, 'b@x.com': {}}
+        mock_gx.list_permissions.assert_called_once_with('file_1')
+        mock_dx._execute_batch.assert_called_once()
+        assert sorted(c.kwargs['permissionId'] for c in delete.call_args_list) == ['p_a', 'p_b']
+        mock_gx.remove_permission.assert_not_called()
+
 
 class TestCreate:
     """Tests for create() method.